@@ -1,20 +1,44 @@
 import discord
 import asyncio
+import heapq
+import itertools
 import json
 import os
+import time
 from datetime import datetime, timedelta
 from redbot.core import commands, checks
 from redbot.core.bot import Red
 
+# A run this late (seconds) counts as missed, e.g. because the bot was down.
+MISSED_GRACE = 60
+# Most missed runs the "all" policy will replay for one announcement.
+MAX_CATCHUP = 10
+# What to do with missed runs:
+#   skip - drop them and wait for the next run that is still ahead
+#   once - send a single catch-up announcement, then resume the schedule
+#   all  - send every missed run (up to MAX_CATCHUP), then resume
+MISSED_POLICIES = ("skip", "once", "all")
+
 class Announcer(commands.Cog):
     """Schedule announcements with optional repeats and role mentions."""
 
     def __init__(self, bot: Red):
         self.bot = bot
         self.file_path = os.path.join(os.path.dirname(__file__), "announcements.json")
+        self.settings_path = os.path.join(os.path.dirname(__file__), "settings.json")
         self.announcements = []
+        self.settings = {}
+        # Min-heap of (time, seq, announcement) over self.announcements,
+        # which stays in insertion order for list/delete indices.
+        self._queue = []
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
         self.load_announcements()
-        self.bot.loop.create_task(self.announcement_loop())
+        self.load_settings()
+        self._task = self.bot.loop.create_task(self.announcement_loop())
+
+    def cog_unload(self):
+        self._task.cancel()
 
     def load_announcements(self):
         if os.path.exists(self.file_path):
@@ -22,11 +46,33 @@ class Announcer(commands.Cog):
                 self.announcements = json.load(f)
         else:
             self.announcements = []
+        self._rebuild_queue()
 
     def save_announcements(self):
         with open(self.file_path, "w") as f:
             json.dump(self.announcements, f)
 
+    def load_settings(self):
+        if os.path.exists(self.settings_path):
+            with open(self.settings_path, "r") as f:
+                self.settings = json.load(f)
+        else:
+            self.settings = {}
+
+    def save_settings(self):
+        with open(self.settings_path, "w") as f:
+            json.dump(self.settings, f)
+
+    def _rebuild_queue(self):
+        """Re-derive the heap from self.announcements and wake the loop.
+
+        Scheduling and deleting are rare admin actions, so they rebuild
+        rather than patch the heap in place.
+        """
+        self._queue = [(a["time"], next(self._seq), a) for a in self.announcements]
+        heapq.heapify(self._queue)
+        self._wake.set()
+
     def parse_repeat(self, repeat_str):
         intervals = {"daily": 86400, "hourly": 3600, "weekly": 604800}
         return intervals.get(repeat_str.lower())
@@ -61,6 +107,7 @@ class Announcer(commands.Cog):
         }
 
         self.announcements.append(announcement)
+        self._rebuild_queue()
         self.save_announcements()
         await ctx.send(f"✅ Announcement scheduled for {dt} in {channel.mention}.")
 
@@ -77,8 +124,7 @@ class Announcer(commands.Cog):
             ch = self.bot.get_channel(a["channel_id"])
             role = f"<@&{a['role_id']}>" if a.get("role_id") else "None"
             repeat = a["repeat"]
-            msg += f"**{idx}** | {time} | {ch.mention if ch else 'Unknown'} | Role: {role} | Repeat: {repeat} | Msg: {a['message'][:30]}...
-"
+            msg += f"**{idx}** | {time} | {ch.mention if ch else 'Unknown'} | Role: {role} | Repeat: {repeat} | Msg: {a['message'][:30]}...\n"
 
         await ctx.send(msg)
 
@@ -87,33 +133,88 @@ class Announcer(commands.Cog):
         """Delete a scheduled announcement."""
         try:
             removed = self.announcements.pop(index)
+            self._rebuild_queue()
             self.save_announcements()
             await ctx.send("✅ Announcement deleted.")
         except IndexError:
             await ctx.send("Invalid index.")
 
+    @announce.command()
+    async def missed(self, ctx, policy: str = None):
+        """
+        Show or set what happens to runs missed while the bot was down.
+        skip: drop them, once: send one catch-up, all: send each missed run
+        """
+        current = self.settings.get("missed", "once")
+        if policy is None:
+            await ctx.send(f"Missed runs policy: **{current}**.")
+            return
+        policy = policy.lower()
+        if policy not in MISSED_POLICIES:
+            await ctx.send(f"Policy must be one of: {', '.join(MISSED_POLICIES)}.")
+            return
+        self.settings["missed"] = policy
+        self.save_settings()
+        await ctx.send(f"✅ Missed runs policy set to **{policy}**.")
+
+    def _runs_due(self, a, now):
+        """How many times to send a due announcement, and its next time.
+
+        Repeats advance from the scheduled time, not from now, so they
+        stay on their original grid however late the loop wakes. The
+        next time is None when the announcement is finished.
+        """
+        repeat = a.get("repeat")
+        late = now - a["time"]
+        policy = self.settings.get("missed", "once")
+        if late <= MISSED_GRACE or policy == "once":
+            sends = 1
+        elif policy == "skip":
+            sends = 0
+        else:
+            sends = min(int(late // repeat) + 1, MAX_CATCHUP) if repeat else 1
+        if not repeat:
+            return sends, None
+        # First slot on the grid that is still ahead of now.
+        return sends, a["time"] + (int(late // repeat) + 1) * repeat
+
     async def announcement_loop(self):
+        """Sleep until the next announcement is due, then send it."""
         await self.bot.wait_until_ready()
         while not self.bot.is_closed():
-            now = datetime.utcnow().timestamp()
-            due = [a for a in self.announcements if a["time"] <= now]
-            self.announcements = [a for a in self.announcements if a["time"] > now or a["repeat"]]
-
-            for a in due:
-                channel = self.bot.get_channel(a["channel_id"])
-                if not channel:
-                    continue
-
-                role_mention = f"<@&{a['role_id']}>" if a.get("role_id") else ""
-                try:
-                    await channel.send(f"{role_mention} {a['message']}")
-                except discord.Forbidden:
-                    continue
-
-                if a.get("repeat"):
-                    a["time"] = now + a["repeat"]
-                    self.announcements.append(a)
-
-            if due:
+            now = time.time()
+            # Reschedule everything that is due before sending anything, so
+            # a schedule/delete during a slow send can't see stale times.
+            outgoing, fired = [], False
+            while self._queue and self._queue[0][0] <= now:
+                a = heapq.heappop(self._queue)[2]
+                fired = True
+                sends, next_time = self._runs_due(a, now)
+                outgoing.extend([a] * sends)
+                if next_time is None:
+                    self.announcements.remove(a)
+                else:
+                    a["time"] = next_time
+                    heapq.heappush(self._queue, (next_time, next(self._seq), a))
+            if fired:
                 self.save_announcements()
-            await asyncio.sleep(60)
+
+            for a in outgoing:
+                await self._send(a)
+
+            self._wake.clear()
+            timeout = max(0, self._queue[0][0] - time.time()) if self._queue else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _send(self, a):
+        channel = self.bot.get_channel(a["channel_id"])
+        if not channel:
+            return
+        role_mention = f"<@&{a['role_id']}>" if a.get("role_id") else ""
+        try:
+            await channel.send(f"{role_mention} {a['message']}")
+        except discord.Forbidden:
+            pass
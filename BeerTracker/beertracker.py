@@ -1,6 +1,9 @@
+import asyncio
 import discord
 import json
+import logging
 import os
+import tempfile
 import datetime
 from typing import Optional
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
@@ -8,10 +11,17 @@ from redbot.core import commands
 from redbot.core.bot import Red
 from redbot.core.utils.chat_formatting import humanize_timedelta
 
+from .db import BeerDB
+
 WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 BEER_COOLDOWN = 60  # seconds between logs per user (anti-spam)
 COUNT_MILESTONES = {10, 50, 100, 250, 500, 1000}
 STREAK_MILESTONES = {7, 30, 100, 365}
+EPOCH = datetime.date(1970, 1, 1)
+COMPACT_INTERVAL = 300  # seconds between background journal compaction checks
+COMPACT_THRESHOLD = 500  # journal records before folding them into the snapshot
+
+log = logging.getLogger("red.BeerTracker")
 
 
 class BeerTracker(commands.Cog):
@@ -20,11 +30,58 @@ class BeerTracker(commands.Cog):
     def __init__(self, bot: Red):
         self.bot = bot
         self.file_path = os.path.join(os.path.dirname(__file__), "beers.json")
+        self.journal_path = os.path.join(os.path.dirname(__file__), "beers.journal")
         self.settings_path = os.path.join(os.path.dirname(__file__), "settings.json")
+        self.db_path = os.path.join(os.path.dirname(__file__), "beers.db")
         self.beers = []
+        self._rollups = {}
         self.settings = {}
-        self.load_beers()
+        self.db = None
+        self._journal_records = 0
+        self._compact_lock = asyncio.Lock()
+        self._compact_write = None  # snapshot write running in the executor
         self.load_settings()
+        # With the SQLite backend the history stays on disk; nothing is
+        # loaded up front.
+        if self.settings.get("backend") == "sqlite":
+            self.db = BeerDB(self.db_path)
+        else:
+            self.load_beers()
+        self._compact_task = self.bot.loop.create_task(self.compaction_loop())
+
+    async def cog_unload(self):
+        self._compact_task.cancel()
+        if self.db:
+            self.db.close()
+            return
+        # Cancelling the task doesn't stop a snapshot write already running
+        # in the executor; let it land first so it can't overwrite the
+        # final save with older entries.
+        if self._compact_write is not None:
+            try:
+                await self._compact_write
+            except Exception:
+                log.exception("Beer journal compaction failed")
+        self.save_beers()
+
+    # -- storage ---------------------------------------------------------
+    #
+    # beers.json is a snapshot of every entry; beers.journal holds one JSON
+    # record per change made since that snapshot, so logging a beer only
+    # appends a line. Records are:
+    #   {"op": "add", "entry": {...}}
+    #   {"op": "undo", "guild_id": ..., "user_id": ..., "timestamp": ...}
+    #   {"op": "clear", "guild_id": ..., "timestamp": ...}
+    # Replay is idempotent, so a crash between writing a new snapshot and
+    # deleting the journal it absorbed can't double-count anything.
+
+    @property
+    def _rotated_journal_path(self):
+        return self.journal_path + ".compacting"
+
+    @staticmethod
+    def _entry_key(entry):
+        return (entry.get("guild_id"), entry["user_id"], entry["timestamp"])
 
     def load_beers(self):
         if os.path.exists(self.file_path):
@@ -32,10 +89,133 @@ class BeerTracker(commands.Cog):
                 self.beers = json.load(f)
         else:
             self.beers = []
+        # A leftover rotated journal means a compaction was interrupted;
+        # it predates the live journal, so replay it first.
+        self._journal_records = 0
+        torn = False
+        for path in (self._rotated_journal_path, self.journal_path):
+            applied, skipped = self._replay_journal(path)
+            self._journal_records += applied
+            torn = torn or skipped
+        self._rebuild_rollups()
+        # Compact straight away after a torn write, otherwise the next
+        # append would land on the same line as the fragment and be lost.
+        if torn:
+            self.save_beers()
+
+    def _replay_journal(self, path):
+        """Apply the records in a journal file to self.beers.
+
+        Returns (records applied, whether any line was unreadable). A torn
+        final line from a crash mid-write is skipped.
+        """
+        if not os.path.exists(path):
+            return 0, False
+        keys = {self._entry_key(b) for b in self.beers}
+        applied, skipped = 0, False
+        with open(path, "r") as f:
+            for lineno, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    log.warning("Skipping corrupt journal line %d in %s", lineno, path)
+                    skipped = True
+                    continue
+                op = record.get("op")
+                if op == "add":
+                    entry = record["entry"]
+                    key = self._entry_key(entry)
+                    if key not in keys:
+                        keys.add(key)
+                        self.beers.append(entry)
+                elif op == "undo":
+                    key = (record["guild_id"], record["user_id"], record["timestamp"])
+                    if key in keys:
+                        keys.discard(key)
+                        self.beers = [
+                            b for b in self.beers if self._entry_key(b) != key
+                        ]
+                elif op == "clear":
+                    gid, cutoff = record["guild_id"], record["timestamp"]
+                    self.beers = [
+                        b
+                        for b in self.beers
+                        if b.get("guild_id") != gid or b["timestamp"] > cutoff
+                    ]
+                    keys = {self._entry_key(b) for b in self.beers}
+                applied += 1
+        return applied, skipped
+
+    def _append_journal(self, record):
+        """Durably append one change record to the journal."""
+        with open(self.journal_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_records += 1
+
+    @staticmethod
+    def _write_snapshot(path, data):
+        """Atomically replace the snapshot at path with serialized data."""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
 
     def save_beers(self):
-        with open(self.file_path, "w") as f:
-            json.dump(self.beers, f)
+        """Write a full snapshot and discard the journal it absorbed."""
+        self._write_snapshot(self.file_path, json.dumps(self.beers))
+        for path in (self._rotated_journal_path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self._journal_records = 0
+
+    async def compact_beers(self):
+        """Fold the journal into the snapshot without blocking the loop.
+
+        The live journal is rotated aside first so beers logged while the
+        snapshot is being written keep appending to a fresh journal.
+        """
+        async with self._compact_lock:
+            # A rotated journal left by an earlier failed compaction is
+            # already reflected in memory, so the snapshot below absorbs it.
+            if not os.path.exists(self._rotated_journal_path):
+                if not os.path.exists(self.journal_path):
+                    return
+                os.replace(self.journal_path, self._rotated_journal_path)
+            self._journal_records = 0
+            entries = list(self.beers)
+            self._compact_write = self.bot.loop.run_in_executor(
+                None,
+                lambda: self._write_snapshot(self.file_path, json.dumps(entries)),
+            )
+            try:
+                # Shielded so cancelling compaction leaves the write for
+                # cog_unload to wait on.
+                await asyncio.shield(self._compact_write)
+            finally:
+                if self._compact_write.done():
+                    self._compact_write = None
+            os.remove(self._rotated_journal_path)
+
+    async def compaction_loop(self):
+        while True:
+            await asyncio.sleep(COMPACT_INTERVAL)
+            if self._journal_records < COMPACT_THRESHOLD:
+                continue
+            try:
+                await self.compact_beers()
+            except OSError:
+                log.exception("Beer journal compaction failed")
 
     def load_settings(self):
         if os.path.exists(self.settings_path):
@@ -127,6 +307,225 @@ class BeerTracker(commands.Cog):
             cursor -= datetime.timedelta(days=1)
         return streak
 
+    # -- rollups ---------------------------------------------------------
+    #
+    # Hourly UTC buckets backing [p]beerstats, kept per scope: a guild id, or
+    # None for every guild (the scope beerstats uses in DMs). "week" caches
+    # the buckets folded into the 168 hour-of-week slots of one timezone and
+    # is kept current on write until the guild's timezone changes.
+
+    def _rebuild_rollups(self):
+        self._rollups = {}
+        for entry in self.beers:
+            self._rollup_add(entry)
+
+    @staticmethod
+    def _rollup_scopes(entry):
+        scopes = [None]
+        if entry.get("guild_id") is not None:
+            scopes.append(entry["guild_id"])
+        return scopes
+
+    @staticmethod
+    def _bump(counts, key, delta):
+        value = counts.get(key, 0) + delta
+        if value:
+            counts[key] = value
+        else:
+            counts.pop(key, None)
+
+    def _rollup_add(self, entry, delta=1):
+        hour = int(entry["timestamp"] // 3600)
+        uid = entry["user_id"]
+        for scope in self._rollup_scopes(entry):
+            rollup = self._rollups.setdefault(
+                scope,
+                {"total": 0, "hours": {}, "users": {}, "names": {}, "week": None},
+            )
+            rollup["total"] += delta
+            self._bump(rollup["hours"], hour, delta)
+            self._bump(rollup["users"], uid, delta)
+            if delta > 0:
+                rollup["names"][uid] = entry.get("user_name", f"User {uid}")
+            elif uid not in rollup["users"]:
+                rollup["names"].pop(uid, None)
+            week = rollup["week"]
+            if week is not None:
+                week["bins"][self._week_slot(hour, week["tz"])] += delta
+
+    def _rollup_remove(self, entry):
+        self._rollup_add(entry, delta=-1)
+
+    @classmethod
+    def _week_slot(cls, hour, tz):
+        """Local hour-of-week (0 = Monday 00:00) of a UTC hour bucket."""
+        dt = cls._to_dt(hour * 3600).astimezone(tz)
+        return dt.weekday() * 24 + dt.hour
+
+    def _week_bins(self, rollup, tz):
+        """The rollup's hour-of-week counts in tz, building them if needed."""
+        week = rollup["week"]
+        if week is None or week["tz"] != tz:
+            bins = self._fold_week(rollup["hours"].items(), tz)
+            week = rollup["week"] = {"tz": tz, "bins": bins}
+        return week["bins"]
+
+    @classmethod
+    def _fold_week(cls, hour_counts, tz):
+        """Fold (UTC hour number, count) pairs into 168 hour-of-week slots."""
+        bins = [0] * 168
+        for hour, count in hour_counts:
+            bins[cls._week_slot(hour, tz)] += count
+        return bins
+
+    # -- data access -----------------------------------------------------
+    #
+    # Commands read and write through these so they work against either
+    # backend: the in-memory list (beers.json + journal) or beers.db.
+
+    @staticmethod
+    def _scope_id(ctx):
+        """Guild id commands are scoped to; None (every guild) in DMs."""
+        return ctx.guild.id if ctx.guild else None
+
+    def _user_entries(self, ctx, user_id):
+        return sorted(
+            (e for e in self._guild_entries(ctx) if e["user_id"] == user_id),
+            key=lambda e: e["timestamp"],
+        )
+
+    async def _add_entry(self, entry):
+        if self.db:
+            await self.db.add(entry)
+            return
+        self.beers.append(entry)
+        self._rollup_add(entry)
+        self._append_journal({"op": "add", "entry": entry})
+
+    async def _undo_last(self, ctx, user_id):
+        """Remove and return a user's most recent entry, or None."""
+        if self.db:
+            return await self.db.undo_last(self._scope_id(ctx), user_id)
+        mine = self._user_entries(ctx, user_id)
+        if not mine:
+            return None
+        last = mine[-1]
+        self.beers.remove(last)
+        self._rollup_remove(last)
+        self._append_journal(
+            {
+                "op": "undo",
+                "guild_id": last.get("guild_id"),
+                "user_id": last["user_id"],
+                "timestamp": last["timestamp"],
+            }
+        )
+        return last
+
+    async def _clear_guild(self, guild_id):
+        """Delete every entry in a guild; returns how many were removed."""
+        if self.db:
+            return await self.db.clear(guild_id)
+        before = len(self.beers)
+        self.beers = [b for b in self.beers if b.get("guild_id") != guild_id]
+        removed = before - len(self.beers)
+        self._rebuild_rollups()
+        self._append_journal(
+            {
+                "op": "clear",
+                "guild_id": guild_id,
+                "timestamp": self._utcnow().timestamp(),
+            }
+        )
+        return removed
+
+    async def _user_counts(self, ctx, user_id, since):
+        """A user's total beers in scope, and how many were at or after since."""
+        if self.db:
+            scope = self._scope_id(ctx)
+            total = await self.db.count(scope, user_id)
+            return total, await self.db.count(scope, user_id, since)
+        mine = self._user_entries(ctx, user_id)
+        return len(mine), sum(1 for e in mine if e["timestamp"] >= since)
+
+    async def _user_streak(self, ctx, user_id):
+        if self.db:
+            today = int(self._utcnow().timestamp() // 86400)
+            return await self.db.streak(self._scope_id(ctx), user_id, today)
+        mine = self._user_entries(ctx, user_id)
+        return self._current_streak([e["timestamp"] for e in mine])
+
+    async def _recent_entries(self, ctx, limit, user_id=None):
+        """The newest limit entries in scope, newest first."""
+        if self.db:
+            return await self.db.recent(self._scope_id(ctx), user_id, limit)
+        entries = self._guild_entries(ctx)
+        if user_id is not None:
+            entries = [e for e in entries if e["user_id"] == user_id]
+        return entries[-limit:][::-1]
+
+    async def _profile(self, ctx, user_id):
+        """Figures behind [p]mybeers, or None if the user has no beers."""
+        if self.db:
+            profile = await self.db.profile(self._scope_id(ctx), user_id)
+            if profile is None:
+                return None
+            profile["best_day"] = EPOCH + datetime.timedelta(days=profile["best_day"])
+            profile["streak"] = await self._user_streak(ctx, user_id)
+            return profile
+
+        timestamps = [e["timestamp"] for e in self._user_entries(ctx, user_id)]
+        if not timestamps:
+            return None
+        hours = [0] * 24
+        day_counts = {}
+        for ts in timestamps:
+            dt = self._to_dt(ts)
+            hours[dt.hour] += 1
+            day_counts[dt.date()] = day_counts.get(dt.date(), 0) + 1
+        best_day, best_day_count = max(day_counts.items(), key=lambda x: x[1])
+        return {
+            "total": len(timestamps),
+            "first": timestamps[0],
+            "last": timestamps[-1],
+            "hours": hours,
+            "best_day": best_day,
+            "best_day_count": best_day_count,
+            "streak": self._current_streak(timestamps),
+        }
+
+    async def _guild_stats(self, ctx, tz):
+        """Figures behind [p]beerstats, or None if nothing is logged."""
+        scope = self._scope_id(ctx)
+        week_ago = (self._utcnow() - datetime.timedelta(days=7)).timestamp()
+        if self.db:
+            total = await self.db.count(scope)
+            if not total:
+                return None
+            leaders = await self.db.leaderboard(scope, 10)
+            return {
+                "total": total,
+                "leaders": [(name, count) for _, name, count in leaders],
+                "bins": self._fold_week(await self.db.hour_buckets(scope), tz),
+                "last7": await self.db.count(scope, since=week_ago),
+            }
+
+        rollup = self._rollups.get(scope)
+        if not rollup or not rollup["total"]:
+            return None
+        ranked = sorted(rollup["users"].items(), key=lambda x: x[1], reverse=True)
+        # Whole hourly buckets, so this can include up to an hour more than
+        # exactly seven days.
+        week_ago_hour = int(week_ago // 3600)
+        return {
+            "total": rollup["total"],
+            "leaders": [(rollup["names"][uid], c) for uid, c in ranked[:10]],
+            "bins": self._week_bins(rollup, tz),
+            "last7": sum(
+                n for hour, n in rollup["hours"].items() if hour >= week_ago_hour
+            ),
+        }
+
     # -- commands --------------------------------------------------------
 
     @commands.group(name="beer", invoke_without_command=True)
@@ -142,8 +541,7 @@ class BeerTracker(commands.Cog):
         }
         if note:
             entry["note"] = note
-        self.beers.append(entry)
-        self.save_beers()
+        await self._add_entry(entry)
 
         lines = [
             f"🍺 Cheers! {ctx.author.mention} logged a beer at {self._fmt(now.timestamp())}."
@@ -152,20 +550,16 @@ class BeerTracker(commands.Cog):
             lines.append(f"📝 Beer: {note}")
 
         # Milestones (per-guild, computed against this user's history).
-        mine = sorted(
-            (e for e in self._guild_entries(ctx) if e["user_id"] == ctx.author.id),
-            key=lambda e: e["timestamp"],
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        total, today_count = await self._user_counts(
+            ctx, ctx.author.id, midnight.timestamp()
         )
-        total = len(mine)
         if total in COUNT_MILESTONES:
             lines.append(f"🎉 Milestone: that's **{total}** beers logged!")
 
         # Streak milestones fire once, on the first beer of the day.
-        today_count = sum(
-            1 for e in mine if self._to_dt(e["timestamp"]).date() == now.date()
-        )
         if today_count == 1:
-            streak = self._current_streak([e["timestamp"] for e in mine])
+            streak = await self._user_streak(ctx, ctx.author.id)
             if streak in STREAK_MILESTONES:
                 lines.append(f"🔥 Streak milestone: **{streak}** days in a row!")
 
@@ -267,19 +661,50 @@ class BeerTracker(commands.Cog):
         )
         await ctx.send(embed=embed)
 
+    @beer.command(name="backend")
+    @commands.is_owner()
+    async def beer_backend(self, ctx, backend: Optional[str] = None):
+        """Show the storage backend, or move beer logs into SQLite.
+
+        `[p]beer backend sqlite` copies every logged beer into beers.db once
+        and keeps the old beers.json as beers.json.migrated.
+        """
+        current = "sqlite" if self.db else "json"
+        if backend is None:
+            await ctx.send(f"🗄️ Beer logs are stored in **{current}**.")
+            return
+        backend = backend.strip().lower()
+        if backend == current:
+            await ctx.send(f"🗄️ Beer logs are already stored in **{current}**.")
+            return
+        if backend != "sqlite":
+            await ctx.send("❌ Beer logs can only be moved from `json` to `sqlite`.")
+            return
+
+        db = BeerDB(self.db_path)
+        if await db.count(None):
+            db.close()
+            await ctx.send("❌ beers.db already holds beer logs; not migrating over them.")
+            return
+
+        # Fold the journal into beers.json and keep it as a backup, then
+        # route new logs to SQLite before copying the history across.
+        self.save_beers()
+        os.replace(self.file_path, self.file_path + ".migrated")
+        entries, self.beers, self._rollups = self.beers, [], {}
+        self.db = db
+        self.settings["backend"] = "sqlite"
+        self.save_settings()
+        migrated = await db.migrate(entries)
+        await ctx.send(f"✅ Moved {migrated} beer log entr{'y' if migrated == 1 else 'ies'} into SQLite.")
+
     @beer.command(name="undo")
     async def beer_undo(self, ctx):
         """Remove your most recent beer log entry."""
-        mine = sorted(
-            (e for e in self._guild_entries(ctx) if e["user_id"] == ctx.author.id),
-            key=lambda e: e["timestamp"],
-        )
-        if not mine:
+        last = await self._undo_last(ctx, ctx.author.id)
+        if last is None:
             await ctx.send("You have no beers to undo. 🍺")
             return
-        last = mine[-1]
-        self.beers.remove(last)
-        self.save_beers()
         await ctx.send(f"↩️ Removed your beer logged at {self._fmt(last['timestamp'])}.")
 
     @commands.command(name="beerclear")
@@ -287,10 +712,7 @@ class BeerTracker(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def beerclear(self, ctx):
         """Clear all beer logs for this server (admin only)."""
-        before = len(self.beers)
-        self.beers = [b for b in self.beers if b.get("guild_id") != ctx.guild.id]
-        removed = before - len(self.beers)
-        self.save_beers()
+        removed = await self._clear_guild(ctx.guild.id)
         await ctx.send(
             f"🧹 Cleared {removed} beer log entr{'y' if removed == 1 else 'ies'}."
         )
@@ -302,16 +724,12 @@ class BeerTracker(commands.Cog):
         """Show recent beer log entries, optionally for one user."""
         limit = max(1, min(limit, 25))
 
-        entries = self._guild_entries(ctx)
-        if member:
-            entries = [e for e in entries if e["user_id"] == member.id]
-
-        if not entries:
+        recent = await self._recent_entries(ctx, limit, member.id if member else None)
+        if not recent:
             who = member.display_name if member else "anyone"
             await ctx.send(f"No beers logged for {who} yet. 🍺")
             return
 
-        recent = entries[-limit:][::-1]
         title = (
             f"🍺 Recent Beers — {member.display_name}"
             if member
@@ -333,21 +751,17 @@ class BeerTracker(commands.Cog):
     async def mybeers(self, ctx, member: Optional[discord.Member] = None):
         """Show a beer profile for yourself or another user."""
         member = member or ctx.author
-        entries = sorted(
-            (e for e in self._guild_entries(ctx) if e["user_id"] == member.id),
-            key=lambda e: e["timestamp"],
-        )
-        if not entries:
+        profile = await self._profile(ctx, member.id)
+        if profile is None:
             await ctx.send(f"{member.display_name} hasn't logged any beers yet. 🍺")
             return
 
-        timestamps = [e["timestamp"] for e in entries]
-        total = len(timestamps)
-        first, last = timestamps[0], timestamps[-1]
+        total = profile["total"]
+        first, last = profile["first"], profile["last"]
 
         if total > 1:
-            gaps = [b - a for a, b in zip(timestamps, timestamps[1:])]
-            avg_gap = humanize_timedelta(seconds=int(sum(gaps) / len(gaps)))
+            # The mean of consecutive gaps telescopes to the overall span.
+            avg_gap = humanize_timedelta(seconds=int((last - first) / (total - 1)))
             avg_str = avg_gap or "less than a second"
         else:
             avg_str = "N/A (need 2+ beers)"
@@ -355,16 +769,11 @@ class BeerTracker(commands.Cog):
         since_last = humanize_timedelta(
             seconds=int(self._utcnow().timestamp() - last)
         )
-        streak = self._current_streak(timestamps)
+        streak = profile["streak"]
 
-        hour_counts = [0] * 24
-        day_counts = {}
-        for ts in timestamps:
-            dt = self._to_dt(ts)
-            hour_counts[dt.hour] += 1
-            day_counts[dt.date()] = day_counts.get(dt.date(), 0) + 1
+        hour_counts = profile["hours"]
         busiest_hour = hour_counts.index(max(hour_counts))
-        best_day, best_day_count = max(day_counts.items(), key=lambda x: x[1])
+        best_day, best_day_count = profile["best_day"], profile["best_day_count"]
 
         embed = discord.Embed(
             title=f"🍺 Beer Profile — {member.display_name}",
@@ -400,33 +809,21 @@ class BeerTracker(commands.Cog):
     @commands.command(name="beerstats")
     async def beerstats(self, ctx):
         """Show the beer leaderboard and server activity analytics."""
-        entries = self._guild_entries(ctx)
-        if not entries:
-            await ctx.send("No beers logged yet. 🍺")
-            return
-
         # Bucket weekday/hour in the guild's configured timezone so a beer
         # logged at 8 PM Saturday local doesn't roll into Sunday on UTC.
         tz = self._guild_tz(ctx.guild)
         tz_name = self._guild_tz_name(ctx.guild)
 
-        counts, names = {}, {}
-        weekday_counts = [0] * 7
-        hour_counts = [0] * 24
-        week_ago = (self._utcnow() - datetime.timedelta(days=7)).timestamp()
-        last7 = 0
-
-        for e in entries:
-            uid = e["user_id"]
-            counts[uid] = counts.get(uid, 0) + 1
-            names[uid] = e.get("user_name", f"User {uid}")
-            dt = self._to_dt(e["timestamp"]).astimezone(tz)
-            weekday_counts[dt.weekday()] += 1
-            hour_counts[dt.hour] += 1
-            if e["timestamp"] >= week_ago:
-                last7 += 1
-
-        ranked = sorted(counts.items(), key=lambda x: x[1], reverse=True)
+        stats = await self._guild_stats(ctx, tz)
+        if stats is None:
+            await ctx.send("No beers logged yet. 🍺")
+            return
+
+        bins = stats["bins"]
+        weekday_counts = [sum(bins[d * 24:(d + 1) * 24]) for d in range(7)]
+        hour_counts = [sum(bins[h::24]) for h in range(24)]
+        last7 = stats["last7"]
+
         busiest_day = WEEKDAY_NAMES[weekday_counts.index(max(weekday_counts))]
         busiest_hour = hour_counts.index(max(hour_counts))
         # Plain-text hour in the guild's TZ so it matches the chart's bucketing
@@ -440,8 +837,8 @@ class BeerTracker(commands.Cog):
             title="🏆 Beer Leaderboard", color=discord.Color.gold()
         )
         embed.description = "\n".join(
-            f"{i}. {names[uid]} — {c} beer{'s' if c != 1 else ''}"
-            for i, (uid, c) in enumerate(ranked[:10], start=1)
+            f"{i}. {name} — {c} beer{'s' if c != 1 else ''}"
+            for i, (name, c) in enumerate(stats["leaders"], start=1)
         )
         embed.add_field(
             name="📅 Activity by Weekday",
@@ -451,7 +848,7 @@ class BeerTracker(commands.Cog):
         embed.add_field(
             name="📊 Summary",
             value=(
-                f"Total beers: **{len(entries)}**\n"
+                f"Total beers: **{stats['total']}**\n"
                 f"Last 7 days: **{last7}**\n"
                 f"Busiest day: **{busiest_day}**\n"
                 f"Busiest hour: **{busiest_hour_str}**"
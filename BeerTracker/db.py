@@ -0,0 +1,230 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+# user_name lives once per user rather than on every entry. The composite
+# index serves every per-guild query; the user index covers DMs, where
+# commands look across all guilds.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id   INTEGER PRIMARY KEY,
+    user_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS beers (
+    id        INTEGER PRIMARY KEY,
+    guild_id  INTEGER,
+    user_id   INTEGER NOT NULL REFERENCES users (user_id),
+    timestamp REAL NOT NULL,
+    note      TEXT
+);
+CREATE INDEX IF NOT EXISTS beers_guild_user_ts ON beers (guild_id, user_id, timestamp);
+CREATE INDEX IF NOT EXISTS beers_user_ts ON beers (user_id, timestamp);
+"""
+
+ENTRY_COLUMNS = "b.user_id, u.user_name, b.guild_id, b.timestamp, b.note"
+
+
+class BeerDB:
+    """SQLite storage for beer logs.
+
+    sqlite3 blocks, so every query runs on a single worker thread, which
+    also serializes access to the connection. A guild_id of None means
+    every guild, matching how the cog scopes commands in DMs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="BeerDB")
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._executor.submit(self._conn.close)
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    @staticmethod
+    def _scope(guild_id, user_id=None, since=None):
+        clauses, params = [], []
+        if guild_id is not None:
+            clauses.append("b.guild_id = ?")
+            params.append(guild_id)
+        if user_id is not None:
+            clauses.append("b.user_id = ?")
+            params.append(user_id)
+        if since is not None:
+            clauses.append("b.timestamp >= ?")
+            params.append(since)
+        return " AND ".join(clauses) or "1", params
+
+    @staticmethod
+    def _entry(row):
+        entry = {
+            "user_id": row[0],
+            "user_name": row[1],
+            "guild_id": row[2],
+            "timestamp": row[3],
+        }
+        if row[4]:
+            entry["note"] = row[4]
+        return entry
+
+    # -- writes ----------------------------------------------------------
+
+    def _insert(self, entries):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO users (user_id, user_name) VALUES (?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET user_name = excluded.user_name",
+                ((e["user_id"], e.get("user_name", f"User {e['user_id']}")) for e in entries),
+            )
+            self._conn.executemany(
+                "INSERT INTO beers (guild_id, user_id, timestamp, note) VALUES (?, ?, ?, ?)",
+                ((e.get("guild_id"), e["user_id"], e["timestamp"], e.get("note")) for e in entries),
+            )
+
+    async def add(self, entry):
+        await self._run(self._insert, [entry])
+
+    def _migrate(self, entries):
+        self._insert(sorted(entries, key=lambda e: e["timestamp"]))
+        return len(entries)
+
+    async def migrate(self, entries):
+        """Bulk-import entries from beers.json; returns how many."""
+        return await self._run(self._migrate, list(entries))
+
+    def _undo_last(self, guild_id, user_id):
+        where, params = self._scope(guild_id, user_id)
+        row = self._conn.execute(
+            f"SELECT b.id, {ENTRY_COLUMNS} FROM beers b JOIN users u USING (user_id) "
+            f"WHERE {where} ORDER BY b.timestamp DESC LIMIT 1",
+            params,
+        ).fetchone()
+        if row is None:
+            return None
+        with self._conn:
+            self._conn.execute("DELETE FROM beers WHERE id = ?", (row[0],))
+        return self._entry(row[1:])
+
+    async def undo_last(self, guild_id, user_id):
+        """Delete and return a user's most recent entry in scope."""
+        return await self._run(self._undo_last, guild_id, user_id)
+
+    def _clear(self, guild_id):
+        with self._conn:
+            return self._conn.execute(
+                "DELETE FROM beers WHERE guild_id = ?", (guild_id,)
+            ).rowcount
+
+    async def clear(self, guild_id):
+        return await self._run(self._clear, guild_id)
+
+    # -- reads -----------------------------------------------------------
+
+    def _count(self, guild_id, user_id, since):
+        where, params = self._scope(guild_id, user_id, since)
+        return self._conn.execute(
+            f"SELECT COUNT(*) FROM beers b WHERE {where}", params
+        ).fetchone()[0]
+
+    async def count(self, guild_id, user_id=None, since=None):
+        return await self._run(self._count, guild_id, user_id, since)
+
+    def _streak(self, guild_id, user_id, today):
+        where, params = self._scope(guild_id, user_id)
+        rows = self._conn.execute(
+            f"SELECT DISTINCT CAST(b.timestamp / 86400 AS INTEGER) AS day "
+            f"FROM beers b WHERE {where} ORDER BY day DESC",
+            params,
+        )
+        streak, expected = 0, None
+        for (day,) in rows:
+            if expected is None:
+                if day < today - 1:
+                    break
+                expected = day
+            if day != expected:
+                break
+            streak += 1
+            expected -= 1
+        return streak
+
+    async def streak(self, guild_id, user_id, today):
+        """Consecutive UTC days (day numbers) with a beer, ending today or yesterday."""
+        return await self._run(self._streak, guild_id, user_id, today)
+
+    def _recent(self, guild_id, user_id, limit):
+        where, params = self._scope(guild_id, user_id)
+        rows = self._conn.execute(
+            f"SELECT {ENTRY_COLUMNS} FROM beers b JOIN users u USING (user_id) "
+            f"WHERE {where} ORDER BY b.timestamp DESC LIMIT ?",
+            params + [limit],
+        )
+        return [self._entry(row) for row in rows]
+
+    async def recent(self, guild_id, user_id, limit):
+        """The newest entries in scope, newest first."""
+        return await self._run(self._recent, guild_id, user_id, limit)
+
+    def _profile(self, guild_id, user_id):
+        where, params = self._scope(guild_id, user_id)
+        total, first, last = self._conn.execute(
+            f"SELECT COUNT(*), MIN(b.timestamp), MAX(b.timestamp) FROM beers b WHERE {where}",
+            params,
+        ).fetchone()
+        if not total:
+            return None
+        hours = [0] * 24
+        for hour, count in self._conn.execute(
+            f"SELECT CAST(b.timestamp / 3600 AS INTEGER) % 24 AS hour, COUNT(*) "
+            f"FROM beers b WHERE {where} GROUP BY hour",
+            params,
+        ):
+            hours[hour] = count
+        best_day, best_day_count = self._conn.execute(
+            f"SELECT CAST(b.timestamp / 86400 AS INTEGER) AS day, COUNT(*) AS n "
+            f"FROM beers b WHERE {where} GROUP BY day ORDER BY n DESC, day LIMIT 1",
+            params,
+        ).fetchone()
+        return {
+            "total": total,
+            "first": first,
+            "last": last,
+            "hours": hours,
+            "best_day": best_day,
+            "best_day_count": best_day_count,
+        }
+
+    async def profile(self, guild_id, user_id):
+        """Aggregates behind [p]mybeers, or None if the user has no beers."""
+        return await self._run(self._profile, guild_id, user_id)
+
+    def _leaderboard(self, guild_id, limit):
+        where, params = self._scope(guild_id)
+        return self._conn.execute(
+            f"SELECT b.user_id, u.user_name, COUNT(*) AS n "
+            f"FROM beers b JOIN users u USING (user_id) WHERE {where} "
+            f"GROUP BY b.user_id ORDER BY n DESC, MIN(b.id) LIMIT ?",
+            params + [limit],
+        ).fetchall()
+
+    async def leaderboard(self, guild_id, limit):
+        """(user_id, user_name, count) rows, biggest drinkers first."""
+        return await self._run(self._leaderboard, guild_id, limit)
+
+    def _hour_buckets(self, guild_id):
+        where, params = self._scope(guild_id)
+        return self._conn.execute(
+            f"SELECT CAST(b.timestamp / 3600 AS INTEGER) AS hour, COUNT(*) "
+            f"FROM beers b WHERE {where} GROUP BY hour",
+            params,
+        ).fetchall()
+
+    async def hour_buckets(self, guild_id):
+        """(UTC hour number, count) rows for every hour with a beer."""
+        return await self._run(self._hour_buckets, guild_id)
@@ -1,4 +1,7 @@
+import bisect
 import discord
+import heapq
+import itertools
 import json
 import os
 import datetime
@@ -8,10 +11,13 @@ from redbot.core import commands
 from redbot.core.bot import Red
 from redbot.core.utils.chat_formatting import humanize_timedelta
 
+from .db import PoopDB
+
 WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 POOP_COOLDOWN = 300  # seconds between logs per user (anti-spam)
 COUNT_MILESTONES = {10, 50, 100, 250, 500, 1000}
 STREAK_MILESTONES = {7, 30, 100, 365}
+EPOCH = datetime.date(1970, 1, 1)
 
 
 class PoopScoop(commands.Cog):
@@ -21,10 +27,25 @@ class PoopScoop(commands.Cog):
         self.bot = bot
         self.file_path = os.path.join(os.path.dirname(__file__), "poops.json")
         self.settings_path = os.path.join(os.path.dirname(__file__), "settings.json")
+        self.db_path = os.path.join(os.path.dirname(__file__), "poops.db")
         self.poops = []
+        self._rollups = {}
+        # guild_id -> user_id -> {"ts": [...], "entries": [...]}, both lists
+        # sorted by timestamp and kept in step so lookups can bisect on "ts".
+        self._index = {}
         self.settings = {}
-        self.load_poops()
+        self.db = None
         self.load_settings()
+        # With the SQLite backend the history stays on disk; nothing is
+        # loaded up front.
+        if self.settings.get("backend") == "sqlite":
+            self.db = PoopDB(self.db_path)
+        else:
+            self.load_poops()
+
+    def cog_unload(self):
+        if self.db:
+            self.db.close()
 
     def load_poops(self):
         if os.path.exists(self.file_path):
@@ -32,6 +53,8 @@ class PoopScoop(commands.Cog):
                 self.poops = json.load(f)
         else:
             self.poops = []
+        self._rebuild_index()
+        self._rebuild_rollups()
 
     def save_poops(self):
         with open(self.file_path, "w") as f:
@@ -75,11 +98,76 @@ class PoopScoop(commands.Cog):
     def _to_dt(timestamp):
         return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
 
-    def _guild_entries(self, ctx):
-        """Poop entries scoped to the current guild (or all in DMs)."""
+    # -- index -----------------------------------------------------------
+
+    def _rebuild_index(self):
+        self._index = {}
+        for entry in sorted(self.poops, key=lambda e: e["timestamp"]):
+            bucket = self._bucket(entry.get("guild_id"), entry["user_id"])
+            bucket["ts"].append(entry["timestamp"])
+            bucket["entries"].append(entry)
+
+    def _bucket(self, guild_id, user_id):
+        users = self._index.setdefault(guild_id, {})
+        return users.setdefault(user_id, {"ts": [], "entries": []})
+
+    def _index_add(self, entry):
+        bucket = self._bucket(entry.get("guild_id"), entry["user_id"])
+        pos = bisect.bisect_right(bucket["ts"], entry["timestamp"])
+        bucket["ts"].insert(pos, entry["timestamp"])
+        bucket["entries"].insert(pos, entry)
+
+    def _index_remove(self, entry):
+        users = self._index.get(entry.get("guild_id"), {})
+        bucket = users.get(entry["user_id"])
+        if bucket is None:
+            return
+        lo = bisect.bisect_left(bucket["ts"], entry["timestamp"])
+        hi = bisect.bisect_right(bucket["ts"], entry["timestamp"])
+        for pos in range(lo, hi):
+            if bucket["entries"][pos] is entry:
+                del bucket["ts"][pos]
+                del bucket["entries"][pos]
+                break
+        if not bucket["entries"]:
+            del users[entry["user_id"]]
+
+    def _scoped_buckets(self, ctx, user_id=None):
+        """Index buckets for the current guild (or every guild in DMs)."""
         if ctx.guild:
-            return [p for p in self.poops if p.get("guild_id") == ctx.guild.id]
-        return list(self.poops)
+            guilds = [self._index.get(ctx.guild.id, {})]
+        else:
+            guilds = self._index.values()
+        for users in guilds:
+            if user_id is None:
+                yield from users.values()
+            elif user_id in users:
+                yield users[user_id]
+
+    def _user_entries(self, ctx, user_id):
+        """One user's entries in scope, oldest first."""
+        buckets = list(self._scoped_buckets(ctx, user_id))
+        if len(buckets) == 1:
+            return buckets[0]["entries"]
+        return list(
+            heapq.merge(*(b["entries"] for b in buckets), key=lambda e: e["timestamp"])
+        )
+
+    def _user_count_since(self, ctx, user_id, since):
+        """How many of a user's in-scope entries are at or after since."""
+        return sum(
+            len(b["ts"]) - bisect.bisect_left(b["ts"], since)
+            for b in self._scoped_buckets(ctx, user_id)
+        )
+
+    def _indexed_recent(self, ctx, limit, user_id=None):
+        """The newest limit entries in scope, newest first."""
+        merged = heapq.merge(
+            *(reversed(b["entries"]) for b in self._scoped_buckets(ctx, user_id)),
+            key=lambda e: e["timestamp"],
+            reverse=True,
+        )
+        return list(itertools.islice(merged, limit))
 
     @staticmethod
     def _fmt(timestamp, style="f"):
@@ -127,6 +215,171 @@ class PoopScoop(commands.Cog):
             cursor -= datetime.timedelta(days=1)
         return streak
 
+    # -- rollups ---------------------------------------------------------
+    #
+    # Hourly UTC buckets backing [p]poopstats, kept per scope: a guild id, or
+    # None for every guild (the scope poopstats uses in DMs).
+
+    def _rebuild_rollups(self):
+        self._rollups = {}
+        for entry in self.poops:
+            self._rollup_add(entry)
+
+    def _rollup_add(self, entry, delta=1):
+        hour = int(entry["timestamp"] // 3600)
+        uid = entry["user_id"]
+        for scope in {None, entry.get("guild_id")}:
+            rollup = self._rollups.setdefault(
+                scope, {"total": 0, "hours": {}, "users": {}, "names": {}}
+            )
+            rollup["total"] += delta
+            for counts, key in ((rollup["hours"], hour), (rollup["users"], uid)):
+                counts[key] = counts.get(key, 0) + delta
+                if not counts[key]:
+                    del counts[key]
+            if delta > 0:
+                rollup["names"][uid] = entry.get("user_name", f"User {uid}")
+
+    def _rollup_remove(self, entry):
+        self._rollup_add(entry, delta=-1)
+
+    @classmethod
+    def _fold_week(cls, hour_counts, tz):
+        """Fold (UTC hour number, count) pairs into 168 local hour-of-week slots."""
+        bins = [0] * 168
+        for hour, count in hour_counts:
+            dt = cls._to_dt(hour * 3600).astimezone(tz)
+            bins[dt.weekday() * 24 + dt.hour] += count
+        return bins
+
+    # -- data access -----------------------------------------------------
+    #
+    # Commands read and write through these so they work against either
+    # backend: the in-memory list and index (poops.json) or poops.db.
+
+    @staticmethod
+    def _scope_id(ctx):
+        """Guild id commands are scoped to; None (every guild) in DMs."""
+        return ctx.guild.id if ctx.guild else None
+
+    async def _add_entry(self, entry):
+        if self.db:
+            await self.db.add(entry)
+            return
+        self.poops.append(entry)
+        self._index_add(entry)
+        self._rollup_add(entry)
+        self.save_poops()
+
+    async def _undo_last(self, ctx, user_id):
+        """Remove and return a user's most recent entry, or None."""
+        if self.db:
+            return await self.db.undo_last(self._scope_id(ctx), user_id)
+        mine = self._user_entries(ctx, user_id)
+        if not mine:
+            return None
+        last = mine[-1]
+        self.poops.remove(last)
+        self._index_remove(last)
+        self._rollup_remove(last)
+        self.save_poops()
+        return last
+
+    async def _clear_guild(self, guild_id):
+        """Delete every entry in a guild; returns how many were removed."""
+        if self.db:
+            return await self.db.clear(guild_id)
+        before = len(self.poops)
+        self.poops = [p for p in self.poops if p.get("guild_id") != guild_id]
+        removed = before - len(self.poops)
+        self._index.pop(guild_id, None)
+        self._rebuild_rollups()
+        self.save_poops()
+        return removed
+
+    async def _user_counts(self, ctx, user_id, since):
+        """A user's total poops in scope, and how many were at or after since."""
+        if self.db:
+            scope = self._scope_id(ctx)
+            total = await self.db.count(scope, user_id)
+            return total, await self.db.count(scope, user_id, since)
+        total = len(self._user_entries(ctx, user_id))
+        return total, self._user_count_since(ctx, user_id, since)
+
+    async def _user_streak(self, ctx, user_id):
+        if self.db:
+            today = int(self._utcnow().timestamp() // 86400)
+            return await self.db.streak(self._scope_id(ctx), user_id, today)
+        mine = self._user_entries(ctx, user_id)
+        return self._current_streak([e["timestamp"] for e in mine])
+
+    async def _recent_entries(self, ctx, limit, user_id=None):
+        """The newest limit entries in scope, newest first."""
+        if self.db:
+            return await self.db.recent(self._scope_id(ctx), user_id, limit)
+        return self._indexed_recent(ctx, limit, user_id)
+
+    async def _profile(self, ctx, user_id):
+        """Figures behind [p]mypoops, or None if the user has no poops."""
+        if self.db:
+            profile = await self.db.profile(self._scope_id(ctx), user_id)
+            if profile is None:
+                return None
+            profile["best_day"] = EPOCH + datetime.timedelta(days=profile["best_day"])
+            profile["streak"] = await self._user_streak(ctx, user_id)
+            return profile
+
+        timestamps = [e["timestamp"] for e in self._user_entries(ctx, user_id)]
+        if not timestamps:
+            return None
+        hours = [0] * 24
+        day_counts = {}
+        for ts in timestamps:
+            dt = self._to_dt(ts)
+            hours[dt.hour] += 1
+            day_counts[dt.date()] = day_counts.get(dt.date(), 0) + 1
+        best_day, best_day_count = max(day_counts.items(), key=lambda x: x[1])
+        return {
+            "total": len(timestamps),
+            "first": timestamps[0],
+            "last": timestamps[-1],
+            "hours": hours,
+            "best_day": best_day,
+            "best_day_count": best_day_count,
+            "streak": self._current_streak(timestamps),
+        }
+
+    async def _guild_stats(self, ctx, tz):
+        """Figures behind [p]poopstats, or None if nothing is logged."""
+        scope = self._scope_id(ctx)
+        week_ago = (self._utcnow() - datetime.timedelta(days=7)).timestamp()
+        if self.db:
+            total = await self.db.count(scope)
+            if not total:
+                return None
+            return {
+                "total": total,
+                "leaders": await self.db.leaderboard(scope, 10),
+                "bins": self._fold_week(await self.db.hour_buckets(scope), tz),
+                "last7": await self.db.count(scope, since=week_ago),
+            }
+
+        rollup = self._rollups.get(scope)
+        if not rollup or not rollup["total"]:
+            return None
+        ranked = sorted(rollup["users"].items(), key=lambda x: x[1], reverse=True)
+        # Whole hourly buckets, so this can include up to an hour more than
+        # exactly seven days.
+        week_ago_hour = int(week_ago // 3600)
+        return {
+            "total": rollup["total"],
+            "leaders": [(rollup["names"][uid], c) for uid, c in ranked[:10]],
+            "bins": self._fold_week(rollup["hours"].items(), tz),
+            "last7": sum(
+                n for hour, n in rollup["hours"].items() if hour >= week_ago_hour
+            ),
+        }
+
     # -- commands --------------------------------------------------------
 
     @commands.group(name="poop", invoke_without_command=True)
@@ -142,8 +395,7 @@ class PoopScoop(commands.Cog):
         }
         if note:
             entry["note"] = note
-        self.poops.append(entry)
-        self.save_poops()
+        await self._add_entry(entry)
 
         lines = [
             f"💩 Logged: {ctx.author.mention} pooped at {self._fmt(now.timestamp())}."
@@ -152,20 +404,16 @@ class PoopScoop(commands.Cog):
             lines.append(f"📝 Note: {note}")
 
         # Milestones (per-guild, computed against this user's history).
-        mine = sorted(
-            (e for e in self._guild_entries(ctx) if e["user_id"] == ctx.author.id),
-            key=lambda e: e["timestamp"],
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        total, today_count = await self._user_counts(
+            ctx, ctx.author.id, midnight.timestamp()
         )
-        total = len(mine)
         if total in COUNT_MILESTONES:
             lines.append(f"🎉 Milestone: that's **{total}** poops logged!")
 
         # Streak milestones fire once, on the first poop of the day.
-        today_count = sum(
-            1 for e in mine if self._to_dt(e["timestamp"]).date() == now.date()
-        )
         if today_count == 1:
-            streak = self._current_streak([e["timestamp"] for e in mine])
+            streak = await self._user_streak(ctx, ctx.author.id)
             if streak in STREAK_MILESTONES:
                 lines.append(f"🔥 Streak milestone: **{streak}** days in a row!")
 
@@ -224,19 +472,51 @@ class PoopScoop(commands.Cog):
         self.save_settings()
         await ctx.send(f"✅ Poopstats timezone set to **{name}**.")
 
+    @poop.command(name="backend")
+    @commands.is_owner()
+    async def poop_backend(self, ctx, backend: Optional[str] = None):
+        """Show the storage backend, or move poop logs into SQLite.
+
+        `[p]poop backend sqlite` copies every logged poop into poops.db once
+        and keeps the old poops.json as poops.json.migrated.
+        """
+        current = "sqlite" if self.db else "json"
+        if backend is None:
+            await ctx.send(f"🗄️ Poop logs are stored in **{current}**.")
+            return
+        backend = backend.strip().lower()
+        if backend == current:
+            await ctx.send(f"🗄️ Poop logs are already stored in **{current}**.")
+            return
+        if backend != "sqlite":
+            await ctx.send("❌ Poop logs can only be moved from `json` to `sqlite`.")
+            return
+
+        db = PoopDB(self.db_path)
+        if await db.count(None):
+            db.close()
+            await ctx.send("❌ poops.db already holds poop logs; not migrating over them.")
+            return
+
+        # Keep poops.json as a backup, then route new logs to SQLite before
+        # copying the history across.
+        self.save_poops()
+        os.replace(self.file_path, self.file_path + ".migrated")
+        entries, self.poops = self.poops, []
+        self._index, self._rollups = {}, {}
+        self.db = db
+        self.settings["backend"] = "sqlite"
+        self.save_settings()
+        migrated = await db.migrate(entries)
+        await ctx.send(f"✅ Moved {migrated} poop log entr{'y' if migrated == 1 else 'ies'} into SQLite.")
+
     @poop.command(name="undo")
     async def poop_undo(self, ctx):
         """Remove your most recent poop log entry."""
-        mine = sorted(
-            (e for e in self._guild_entries(ctx) if e["user_id"] == ctx.author.id),
-            key=lambda e: e["timestamp"],
-        )
-        if not mine:
+        last = await self._undo_last(ctx, ctx.author.id)
+        if last is None:
             await ctx.send("You have no poops to undo. 🚽")
             return
-        last = mine[-1]
-        self.poops.remove(last)
-        self.save_poops()
         await ctx.send(f"↩️ Removed your poop logged at {self._fmt(last['timestamp'])}.")
 
     @commands.command(name="poopclear")
@@ -244,10 +524,7 @@ class PoopScoop(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def poopclear(self, ctx):
         """Clear all poop logs for this server (admin only)."""
-        before = len(self.poops)
-        self.poops = [p for p in self.poops if p.get("guild_id") != ctx.guild.id]
-        removed = before - len(self.poops)
-        self.save_poops()
+        removed = await self._clear_guild(ctx.guild.id)
         await ctx.send(
             f"🧹 Cleared {removed} poop log entr{'y' if removed == 1 else 'ies'}."
         )
@@ -259,16 +536,12 @@ class PoopScoop(commands.Cog):
         """Show recent poop log entries, optionally for one user."""
         limit = max(1, min(limit, 25))
 
-        entries = self._guild_entries(ctx)
-        if member:
-            entries = [e for e in entries if e["user_id"] == member.id]
-
-        if not entries:
+        recent = await self._recent_entries(ctx, limit, member.id if member else None)
+        if not recent:
             who = member.display_name if member else "anyone"
             await ctx.send(f"No poops logged for {who} yet. 🚽")
             return
 
-        recent = entries[-limit:][::-1]
         title = (
             f"💩 Recent Poops — {member.display_name}"
             if member
@@ -290,21 +563,17 @@ class PoopScoop(commands.Cog):
     async def mypoops(self, ctx, member: Optional[discord.Member] = None):
         """Show a poop profile for yourself or another user."""
         member = member or ctx.author
-        entries = sorted(
-            (e for e in self._guild_entries(ctx) if e["user_id"] == member.id),
-            key=lambda e: e["timestamp"],
-        )
-        if not entries:
+        profile = await self._profile(ctx, member.id)
+        if profile is None:
             await ctx.send(f"{member.display_name} hasn't logged any poops yet. 🚽")
             return
 
-        timestamps = [e["timestamp"] for e in entries]
-        total = len(timestamps)
-        first, last = timestamps[0], timestamps[-1]
+        total = profile["total"]
+        first, last = profile["first"], profile["last"]
 
         if total > 1:
-            gaps = [b - a for a, b in zip(timestamps, timestamps[1:])]
-            avg_gap = humanize_timedelta(seconds=int(sum(gaps) / len(gaps)))
+            # The mean of consecutive gaps telescopes to the overall span.
+            avg_gap = humanize_timedelta(seconds=int((last - first) / (total - 1)))
             avg_str = avg_gap or "less than a second"
         else:
             avg_str = "N/A (need 2+ poops)"
@@ -312,16 +581,11 @@ class PoopScoop(commands.Cog):
         since_last = humanize_timedelta(
             seconds=int(self._utcnow().timestamp() - last)
         )
-        streak = self._current_streak(timestamps)
+        streak = profile["streak"]
 
-        hour_counts = [0] * 24
-        day_counts = {}
-        for ts in timestamps:
-            dt = self._to_dt(ts)
-            hour_counts[dt.hour] += 1
-            day_counts[dt.date()] = day_counts.get(dt.date(), 0) + 1
+        hour_counts = profile["hours"]
         busiest_hour = hour_counts.index(max(hour_counts))
-        best_day, best_day_count = max(day_counts.items(), key=lambda x: x[1])
+        best_day, best_day_count = profile["best_day"], profile["best_day_count"]
 
         embed = discord.Embed(
             title=f"💩 Poop Profile — {member.display_name}",
@@ -357,33 +621,21 @@ class PoopScoop(commands.Cog):
     @commands.command(name="poopstats")
     async def poopstats(self, ctx):
         """Show the poop leaderboard and server activity analytics."""
-        entries = self._guild_entries(ctx)
-        if not entries:
-            await ctx.send("No poops logged yet. 🚽")
-            return
-
         # Bucket weekday/hour in the guild's configured timezone so a poop
         # logged at 8 PM Saturday local doesn't roll into Sunday on UTC.
         tz = self._guild_tz(ctx.guild)
         tz_name = self._guild_tz_name(ctx.guild)
 
-        counts, names = {}, {}
-        weekday_counts = [0] * 7
-        hour_counts = [0] * 24
-        week_ago = (self._utcnow() - datetime.timedelta(days=7)).timestamp()
-        last7 = 0
-
-        for e in entries:
-            uid = e["user_id"]
-            counts[uid] = counts.get(uid, 0) + 1
-            names[uid] = e.get("user_name", f"User {uid}")
-            dt = self._to_dt(e["timestamp"]).astimezone(tz)
-            weekday_counts[dt.weekday()] += 1
-            hour_counts[dt.hour] += 1
-            if e["timestamp"] >= week_ago:
-                last7 += 1
-
-        ranked = sorted(counts.items(), key=lambda x: x[1], reverse=True)
+        stats = await self._guild_stats(ctx, tz)
+        if stats is None:
+            await ctx.send("No poops logged yet. 🚽")
+            return
+
+        bins = stats["bins"]
+        weekday_counts = [sum(bins[d * 24:(d + 1) * 24]) for d in range(7)]
+        hour_counts = [sum(bins[h::24]) for h in range(24)]
+        last7 = stats["last7"]
+
         busiest_day = WEEKDAY_NAMES[weekday_counts.index(max(weekday_counts))]
         busiest_hour = hour_counts.index(max(hour_counts))
         # Plain-text hour in the guild's TZ so it matches the chart's bucketing
@@ -397,8 +649,8 @@ class PoopScoop(commands.Cog):
             title="🏆 Poop Leaderboard", color=discord.Color.dark_gold()
         )
         embed.description = "\n".join(
-            f"{i}. {names[uid]} — {c} poop{'s' if c != 1 else ''}"
-            for i, (uid, c) in enumerate(ranked[:10], start=1)
+            f"{i}. {name} — {c} poop{'s' if c != 1 else ''}"
+            for i, (name, c) in enumerate(stats["leaders"], start=1)
         )
         embed.add_field(
             name="📅 Activity by Weekday",
@@ -408,7 +660,7 @@ class PoopScoop(commands.Cog):
         embed.add_field(
             name="📊 Summary",
             value=(
-                f"Total poops: **{len(entries)}**\n"
+                f"Total poops: **{stats['total']}**\n"
                 f"Last 7 days: **{last7}**\n"
                 f"Busiest day: **{busiest_day}**\n"
                 f"Busiest hour: **{busiest_hour_str}**"
@@ -1,32 +1,80 @@
 import discord
 import asyncio
+import collections
+import heapq
+import itertools
 import json
+import logging
 import os
 import datetime
 from redbot.core import commands
 from redbot.core.bot import Red
 from redbot.core.utils.chat_formatting import humanize_timedelta
 
+log = logging.getLogger("red.RemindMe")
+
+# Sends allowed in flight at once, across all channels.
+DELIVERY_WORKERS = 5
+# Attempts per reminder on transient errors, backing off 1s, 2s, 4s...
+MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 1
+# Recent delivery latencies kept for [p]remindme stats.
+LATENCY_SAMPLES = 500
+
 class RemindMe(commands.Cog):
     """Set reminders for yourself!"""
 
     def __init__(self, bot: Red):
         self.bot = bot
         self.file_path = os.path.join(os.path.dirname(__file__), "reminders.json")
+        # Min-heap of (due, seq, reminder); seq breaks ties so the dicts
+        # themselves are never compared.
         self.reminders = []
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        # Due reminders waiting on their channel's worker. Each channel gets
+        # at most one worker, so its sends go out in order and one slow or
+        # rate-limited channel only holds up itself.
+        self._outbox = {}
+        self._workers = set()
+        self._send_slots = asyncio.Semaphore(DELIVERY_WORKERS)
+        self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+        self.delivery_counts = {"delivered": 0, "failed": 0}
         self.load_reminders()
-        self.bot.loop.create_task(self.reminder_loop())
+        self._task = self.bot.loop.create_task(self.reminder_loop())
+
+    def cog_unload(self):
+        self._task.cancel()
+        for task in self._workers:
+            task.cancel()
+        # Cancelled workers leave their queues in the outbox, so anything
+        # popped from the heap but not yet sent is saved here.
+        self.save_reminders()
 
     def load_reminders(self):
         if os.path.exists(self.file_path):
             with open(self.file_path, "r") as f:
-                self.reminders = json.load(f)
+                saved = json.load(f)
         else:
-            self.reminders = []
+            saved = []
+        self.reminders = [(r["due"], next(self._seq), r) for r in saved]
+        heapq.heapify(self.reminders)
 
     def save_reminders(self):
+        # Reminders still awaiting delivery are saved too, so a restart
+        # mid-burst sends them rather than dropping them.
+        pending = [r for _, _, r in sorted(self.reminders)]
+        for queue in self._outbox.values():
+            pending.extend(queue)
         with open(self.file_path, "w") as f:
-            json.dump(self.reminders, f)
+            json.dump(pending, f)
+
+    def schedule(self, reminder):
+        """Queue a reminder, waking the loop if it is now the next one due."""
+        earliest = self.reminders[0][0] if self.reminders else None
+        heapq.heappush(self.reminders, (reminder["due"], next(self._seq), reminder))
+        if earliest is None or reminder["due"] < earliest:
+            self._wake.set()
 
     def parse_time(self, time_str):
         total_seconds = 0
@@ -63,7 +111,7 @@ class RemindMe(commands.Cog):
             return
 
         due = (datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=seconds)).timestamp()
-        self.reminders.append({
+        self.schedule({
             "user_id": ctx.author.id,
             "channel_id": ctx.channel.id,
             "message": message,
@@ -73,21 +121,112 @@ class RemindMe(commands.Cog):
 
         await ctx.send(f"Got it! I'll remind you in {humanize_timedelta(timedelta=datetime.timedelta(seconds=seconds))}.")
 
+    @remindme.command(name="stats")
+    @commands.is_owner()
+    async def remindme_stats(self, ctx):
+        """Show reminder delivery counts and latency."""
+        lines = [
+            f"Pending: **{len(self.reminders)}**",
+            f"Delivered: **{self.delivery_counts['delivered']}**",
+            f"Failed: **{self.delivery_counts['failed']}**",
+        ]
+        if self.latencies:
+            ordered = sorted(self.latencies)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            lines.append(
+                f"Latency (last {len(ordered)}): avg {sum(ordered) / len(ordered):.2f}s, "
+                f"p95 {p95:.2f}s, max {ordered[-1]:.2f}s"
+            )
+        await ctx.send("\n".join(lines))
+
     async def reminder_loop(self):
+        """Sleep until the earliest reminder is due, then deliver it.
+
+        With nothing queued the loop waits on the wake event alone;
+        schedule() sets it when a new reminder jumps the queue.
+        """
         await self.bot.wait_until_ready()
         while not self.bot.is_closed():
             now = datetime.datetime.now(datetime.timezone.utc).timestamp()
-            due_reminders = [r for r in self.reminders if r["due"] <= now]
-            self.reminders = [r for r in self.reminders if r["due"] > now]
-
-            for r in due_reminders:
-                channel = self.bot.get_channel(r["channel_id"])
-                user = self.bot.get_user(r["user_id"])
-                if channel and user:
-                    try:
-                        await channel.send(f"{user.mention} ⏰ Reminder: {r['message']}")
-                    except discord.Forbidden:
-                        pass
+            due_reminders = []
+            while self.reminders and self.reminders[0][0] <= now:
+                due_reminders.append(heapq.heappop(self.reminders)[2])
+
             if due_reminders:
-                self.save_reminders()
-            await asyncio.sleep(30)
+                self.dispatch(due_reminders)
+
+            self._wake.clear()
+            timeout = None
+            if self.reminders:
+                now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+                timeout = max(0, self.reminders[0][0] - now)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    # -- delivery --------------------------------------------------------
+
+    def dispatch(self, reminders):
+        """Hand due reminders to their channels' workers."""
+        for r in reminders:
+            queue = self._outbox.get(r["channel_id"])
+            if queue is not None:
+                queue.append(r)
+                continue
+            self._outbox[r["channel_id"]] = collections.deque([r])
+            task = asyncio.create_task(self._channel_worker(r["channel_id"]))
+            self._workers.add(task)
+            task.add_done_callback(self._workers.discard)
+
+    async def _channel_worker(self, channel_id):
+        queue = self._outbox[channel_id]
+        while queue:
+            try:
+                await self._deliver(queue[0])
+            except Exception:
+                # A bad record or unexpected client error must not strand
+                # the rest of this channel's reminders.
+                log.exception("Failed to deliver reminder %r", queue[0])
+                self.delivery_counts["failed"] += 1
+            queue.popleft()
+        del self._outbox[channel_id]
+        # Persist once the whole burst is out rather than after every send.
+        if not self._outbox:
+            self.save_reminders()
+
+    async def _deliver(self, r):
+        channel = self.bot.get_channel(r["channel_id"])
+        user = self.bot.get_user(r["user_id"])
+        if not (channel and user):
+            self.delivery_counts["failed"] += 1
+            return
+
+        content = f"{user.mention} ⏰ Reminder: {r['message']}"
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                async with self._send_slots:
+                    await channel.send(content)
+            except discord.HTTPException as e:
+                # 429s and server errors are worth retrying; anything else
+                # (missing permissions, deleted channel) won't get better.
+                if e.status != 429 and e.status < 500:
+                    break
+                error = e
+            except (OSError, asyncio.TimeoutError) as e:
+                error = e
+            else:
+                now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+                self.latencies.append(now - r["due"])
+                self.delivery_counts["delivered"] += 1
+                return
+            if attempt + 1 < MAX_ATTEMPTS:
+                delay = RETRY_BASE_DELAY * 2 ** attempt
+                log.debug(
+                    "Reminder send to %s failed (%s), retrying in %ss",
+                    r["channel_id"], error, delay,
+                )
+                await asyncio.sleep(delay)
+        else:
+            log.warning("Giving up on reminder for channel %s: %s", r["channel_id"], error)
+        self.delivery_counts["failed"] += 1
@@ -0,0 +1,234 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+# The user index covers DMs, where commands look across every guild.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id   INTEGER PRIMARY KEY,
+    user_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id        INTEGER PRIMARY KEY,
+    guild_id  INTEGER,
+    user_id   INTEGER NOT NULL REFERENCES users (user_id),
+    timestamp REAL NOT NULL,
+    method    TEXT,
+    unit      TEXT,
+    amount    REAL,
+    note      TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_guild_user_ts ON sessions (guild_id, user_id, timestamp);
+CREATE INDEX IF NOT EXISTS sessions_user_ts ON sessions (user_id, timestamp);
+"""
+
+ENTRY_COLUMNS = "s.user_id, u.user_name, s.timestamp, s.method, s.unit, s.amount, s.note"
+
+
+class WeedDB:
+    """weed.db, queried on a single worker thread. guild_id None is every guild."""
+
+    def __init__(self, path):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="WeedDB")
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._executor.submit(self._conn.close)
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    @staticmethod
+    def _scope(guild_id, user_id=None, since=None):
+        clauses, params = [], []
+        for clause, value in (
+            ("s.guild_id = ?", guild_id),
+            ("s.user_id = ?", user_id),
+            ("s.timestamp >= ?", since),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return " AND ".join(clauses) or "1", params
+
+    @staticmethod
+    def _entry(row):
+        entry = {"user_id": row[0], "user_name": row[1], "timestamp": row[2]}
+        # Sessions logged before methods existed carry none of these keys.
+        for key, value in zip(("method", "unit", "amount"), row[3:6]):
+            if value is not None:
+                entry[key] = value
+        if row[6]:
+            entry["note"] = row[6]
+        return entry
+
+    # -- writes ----------------------------------------------------------
+
+    def _insert(self, entries):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO users (user_id, user_name) VALUES (?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET user_name = excluded.user_name",
+                ((e["user_id"], e.get("user_name", f"User {e['user_id']}")) for e in entries),
+            )
+            self._conn.executemany(
+                "INSERT INTO sessions (guild_id, user_id, timestamp, method, unit, amount, note) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (e.get("guild_id"), e["user_id"], e["timestamp"])
+                    + tuple(e.get(key) for key in ("method", "unit", "amount", "note"))
+                    for e in entries
+                ),
+            )
+
+    async def add(self, entry):
+        await self._run(self._insert, [entry])
+
+    async def migrate(self, entries):
+        """Bulk-import entries from weed.json; returns how many."""
+        entries = sorted(entries, key=lambda e: e["timestamp"])
+        await self._run(self._insert, entries)
+        return len(entries)
+
+    def _undo_last(self, guild_id, user_id):
+        where, params = self._scope(guild_id, user_id)
+        row = self._conn.execute(
+            f"SELECT s.id, {ENTRY_COLUMNS} FROM sessions s JOIN users u USING (user_id) "
+            f"WHERE {where} ORDER BY s.timestamp DESC LIMIT 1",
+            params,
+        ).fetchone()
+        if row is None:
+            return None
+        with self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE id = ?", (row[0],))
+        return self._entry(row[1:])
+
+    async def undo_last(self, guild_id, user_id):
+        return await self._run(self._undo_last, guild_id, user_id)
+
+    def _clear(self, guild_id):
+        with self._conn:
+            return self._conn.execute("DELETE FROM sessions WHERE guild_id = ?", (guild_id,)).rowcount
+
+    async def clear(self, guild_id):
+        return await self._run(self._clear, guild_id)
+
+    # -- reads -----------------------------------------------------------
+
+    def _count(self, guild_id, user_id, since):
+        where, params = self._scope(guild_id, user_id, since)
+        return self._conn.execute(f"SELECT COUNT(*) FROM sessions s WHERE {where}", params).fetchone()[0]
+
+    async def count(self, guild_id, user_id=None, since=None):
+        return await self._run(self._count, guild_id, user_id, since)
+
+    def _streak(self, guild_id, user_id, today):
+        where, params = self._scope(guild_id, user_id)
+        rows = self._conn.execute(
+            f"SELECT DISTINCT CAST(s.timestamp / 86400 AS INTEGER) AS day "
+            f"FROM sessions s WHERE {where} ORDER BY day DESC",
+            params,
+        )
+        streak, expected = 0, None
+        for (day,) in rows:
+            if expected is None:
+                if day < today - 1:
+                    break
+                expected = day
+            if day != expected:
+                break
+            streak += 1
+            expected -= 1
+        return streak
+
+    async def streak(self, guild_id, user_id, today):
+        """Consecutive UTC day numbers with a session, ending today or yesterday."""
+        return await self._run(self._streak, guild_id, user_id, today)
+
+    def _recent(self, guild_id, user_id, limit):
+        where, params = self._scope(guild_id, user_id)
+        rows = self._conn.execute(
+            f"SELECT {ENTRY_COLUMNS} FROM sessions s JOIN users u USING (user_id) "
+            f"WHERE {where} ORDER BY s.timestamp DESC LIMIT ?",
+            params + [limit],
+        )
+        return [self._entry(row) for row in rows]
+
+    async def recent(self, guild_id, user_id, limit):
+        return await self._run(self._recent, guild_id, user_id, limit)
+
+    def _profile(self, guild_id, user_id):
+        where, params = self._scope(guild_id, user_id)
+        total, first, last = self._conn.execute(
+            f"SELECT COUNT(*), MIN(s.timestamp), MAX(s.timestamp) FROM sessions s WHERE {where}",
+            params,
+        ).fetchone()
+        if not total:
+            return None
+        hours = [0] * 24
+        for hour, count in self._conn.execute(
+            f"SELECT CAST(s.timestamp / 3600 AS INTEGER) % 24 AS hour, COUNT(*) "
+            f"FROM sessions s WHERE {where} GROUP BY hour",
+            params,
+        ):
+            hours[hour] = count
+        best_day, best_day_count = self._conn.execute(
+            f"SELECT CAST(s.timestamp / 86400 AS INTEGER) AS day, COUNT(*) AS n "
+            f"FROM sessions s WHERE {where} GROUP BY day ORDER BY n DESC, day LIMIT 1",
+            params,
+        ).fetchone()
+        return {
+            "total": total,
+            "first": first,
+            "last": last,
+            "hours": hours,
+            "best_day": best_day,
+            "best_day_count": best_day_count,
+        }
+
+    async def profile(self, guild_id, user_id):
+        """Figures behind [p]myweed (best_day as a day number), or None."""
+        return await self._run(self._profile, guild_id, user_id)
+
+    def _leaderboard(self, guild_id, limit):
+        where, params = self._scope(guild_id)
+        return self._conn.execute(
+            f"SELECT u.user_name, COUNT(*) AS n "
+            f"FROM sessions s JOIN users u USING (user_id) WHERE {where} "
+            f"GROUP BY s.user_id ORDER BY n DESC, MIN(s.id) LIMIT ?",
+            params + [limit],
+        ).fetchall()
+
+    async def leaderboard(self, guild_id, limit):
+        """(user_name, count) rows, most active first."""
+        return await self._run(self._leaderboard, guild_id, limit)
+
+    def _hour_buckets(self, guild_id):
+        where, params = self._scope(guild_id)
+        return self._conn.execute(
+            f"SELECT CAST(s.timestamp / 3600 AS INTEGER) AS hour, COUNT(*) "
+            f"FROM sessions s WHERE {where} GROUP BY hour",
+            params,
+        ).fetchall()
+
+    async def hour_buckets(self, guild_id):
+        """(UTC hour number, count) for every hour with a session."""
+        return await self._run(self._hour_buckets, guild_id)
+
+    def _method_totals(self, guild_id, user_id):
+        where, params = self._scope(guild_id, user_id)
+        return {
+            method: (count, amount, has_amount)
+            for method, count, amount, has_amount in self._conn.execute(
+                f"SELECT s.method, COUNT(*), TOTAL(s.amount), COUNT(s.amount) > 0 "
+                f"FROM sessions s WHERE {where} GROUP BY s.method",
+                params,
+            )
+        }
+
+    async def method_totals(self, guild_id, user_id=None):
+        """method -> (sessions, summed amount, whether any amount was logged)."""
+        return await self._run(self._method_totals, guild_id, user_id)
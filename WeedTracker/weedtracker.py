@@ -1,3 +1,4 @@
+import bisect
 import discord
 import json
 import os
@@ -8,10 +9,13 @@ from redbot.core import commands
 from redbot.core.bot import Red
 from redbot.core.utils.chat_formatting import humanize_timedelta
 
+from .db import WeedDB
+
 WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 WEED_COOLDOWN = 60  # seconds between logs per user (anti-spam)
 COUNT_MILESTONES = {10, 50, 100, 250, 500, 1000}
 STREAK_MILESTONES = {7, 30, 100, 365}
+EPOCH = datetime.date(1970, 1, 1)
 
 # Single source of truth for delivery methods. Each method maps to its display
 # label, emoji, the unit its amount is measured in, and the words that resolve
@@ -57,10 +61,26 @@ class WeedTracker(commands.Cog):
         self.bot = bot
         self.file_path = os.path.join(os.path.dirname(__file__), "weed.json")
         self.settings_path = os.path.join(os.path.dirname(__file__), "settings.json")
+        self.db_path = os.path.join(os.path.dirname(__file__), "weed.db")
         self.sessions = []
+        self._rollups = {}
+        # (guild_id, user_id) -> running totals, see _stats_add. A guild_id
+        # of None aggregates the user's sessions across every guild, which is
+        # the scope commands use in DMs.
+        self._user_stats = {}
         self.settings = {}
-        self.load_sessions()
+        self.db = None
         self.load_settings()
+        # With the SQLite backend the history stays on disk; nothing is
+        # loaded up front.
+        if self.settings.get("backend") == "sqlite":
+            self.db = WeedDB(self.db_path)
+        else:
+            self.load_sessions()
+
+    def cog_unload(self):
+        if self.db:
+            self.db.close()
 
     def load_sessions(self):
         if os.path.exists(self.file_path):
@@ -68,6 +88,8 @@ class WeedTracker(commands.Cog):
                 self.sessions = json.load(f)
         else:
             self.sessions = []
+        self._rebuild_user_stats()
+        self._rebuild_rollups()
 
     def save_sessions(self):
         with open(self.file_path, "w") as f:
@@ -117,6 +139,93 @@ class WeedTracker(commands.Cog):
             return [s for s in self.sessions if s.get("guild_id") == ctx.guild.id]
         return list(self.sessions)
 
+    # -- per-user aggregates ---------------------------------------------
+    #
+    # Each record keeps the distinct UTC days a user logged on (as ordinals),
+    # with parallel lists of the session count on that day and the streak
+    # length ending that day. Logging and undoing touch only the tail, so
+    # milestone checks don't depend on how long the history is.
+
+    def _rebuild_user_stats(self):
+        self._user_stats = {}
+        for entry in sorted(self.sessions, key=lambda e: e["timestamp"]):
+            self._track_session(entry)
+
+    def _stats_scopes(self, entry):
+        scopes = [(None, entry["user_id"])]
+        if entry.get("guild_id") is not None:
+            scopes.append((entry["guild_id"], entry["user_id"]))
+        return scopes
+
+    def _track_session(self, entry):
+        day = self._to_dt(entry["timestamp"]).date().toordinal()
+        for key in self._stats_scopes(entry):
+            stats = self._user_stats.setdefault(
+                key, {"total": 0, "days": [], "counts": [], "streaks": []}
+            )
+            self._stats_add(stats, day)
+
+    def _untrack_session(self, entry):
+        day = self._to_dt(entry["timestamp"]).date().toordinal()
+        for key in self._stats_scopes(entry):
+            stats = self._user_stats.get(key)
+            if stats is None:
+                continue
+            self._stats_remove(stats, day)
+            if not stats["total"]:
+                del self._user_stats[key]
+
+    @classmethod
+    def _stats_add(cls, stats, day):
+        days = stats["days"]
+        i = bisect.bisect_left(days, day)
+        if i < len(days) and days[i] == day:
+            stats["counts"][i] += 1
+        else:
+            days.insert(i, day)
+            stats["counts"].insert(i, 1)
+            stats["streaks"].insert(i, 0)
+            cls._restreak(stats, i)
+        stats["total"] += 1
+
+    @classmethod
+    def _stats_remove(cls, stats, day):
+        days = stats["days"]
+        i = bisect.bisect_left(days, day)
+        if i == len(days) or days[i] != day:
+            return
+        stats["counts"][i] -= 1
+        if not stats["counts"][i]:
+            del days[i], stats["counts"][i], stats["streaks"][i]
+            cls._restreak(stats, i)
+        stats["total"] -= 1
+
+    @staticmethod
+    def _restreak(stats, start):
+        """Recompute streak lengths from index start until they stop changing."""
+        days, streaks = stats["days"], stats["streaks"]
+        for j in range(start, len(days)):
+            consecutive = j > 0 and days[j - 1] == days[j] - 1
+            streak = streaks[j - 1] + 1 if consecutive else 1
+            if streaks[j] == streak:
+                break
+            streaks[j] = streak
+
+    def _scope_stats(self, ctx, user_id):
+        """Aggregates for a user in the current guild (or all guilds in DMs)."""
+        guild_id = ctx.guild.id if ctx.guild else None
+        return self._user_stats.get((guild_id, user_id))
+
+    @classmethod
+    def _stats_streak(cls, stats):
+        """Count consecutive UTC days with at least one session, ending now."""
+        if not stats or not stats["days"]:
+            return 0
+        today = cls._utcnow().date().toordinal()
+        if stats["days"][-1] < today - 1:
+            return 0
+        return stats["streaks"][-1]
+
     @staticmethod
     def _resolve_method(raw) -> Optional[str]:
         """Map a user-typed token to a canonical method key, or None."""
@@ -165,22 +274,205 @@ class WeedTracker(commands.Cog):
             lines.append(f"{label:<4}│{'█' * bar_len} {val}")
         return "\n".join(lines)
 
+    # -- rollups ---------------------------------------------------------
+    #
+    # Hourly UTC buckets backing [p]weedstats, kept per scope: a guild id, or
+    # None for every guild (the scope weedstats uses in DMs).
+
+    def _rebuild_rollups(self):
+        self._rollups = {}
+        for entry in self.sessions:
+            self._rollup_add(entry)
+
+    def _rollup_add(self, entry, delta=1):
+        hour = int(entry["timestamp"] // 3600)
+        uid = entry["user_id"]
+        for scope in {None, entry.get("guild_id")}:
+            rollup = self._rollups.setdefault(
+                scope, {"total": 0, "hours": {}, "users": {}, "methods": {}, "names": {}}
+            )
+            rollup["total"] += delta
+            for counts, key in (
+                (rollup["hours"], hour),
+                (rollup["users"], uid),
+                (rollup["methods"], entry.get("method")),
+            ):
+                counts[key] = counts.get(key, 0) + delta
+                if not counts[key]:
+                    del counts[key]
+            if delta > 0:
+                rollup["names"][uid] = entry.get("user_name", f"User {uid}")
+
+    def _rollup_remove(self, entry):
+        self._rollup_add(entry, delta=-1)
+
     @classmethod
-    def _current_streak(cls, timestamps):
-        """Count consecutive UTC days with at least one session, ending now."""
-        days = {cls._to_dt(ts).date() for ts in timestamps}
-        today = cls._utcnow().date()
-        if today in days:
-            cursor = today
-        elif (today - datetime.timedelta(days=1)) in days:
-            cursor = today - datetime.timedelta(days=1)
-        else:
-            return 0
-        streak = 0
-        while cursor in days:
-            streak += 1
-            cursor -= datetime.timedelta(days=1)
-        return streak
+    def _fold_week(cls, hour_counts, tz):
+        """Fold (UTC hour number, count) pairs into 168 local hour-of-week slots."""
+        bins = [0] * 168
+        for hour, count in hour_counts:
+            dt = cls._to_dt(hour * 3600).astimezone(tz)
+            bins[dt.weekday() * 24 + dt.hour] += count
+        return bins
+
+    # -- data access -----------------------------------------------------
+    #
+    # Commands read and write through these so they work against either
+    # backend: the in-memory list and aggregates (weed.json) or weed.db.
+
+    @staticmethod
+    def _scope_id(ctx):
+        """Guild id commands are scoped to; None (every guild) in DMs."""
+        return ctx.guild.id if ctx.guild else None
+
+    def _user_entries(self, ctx, user_id):
+        return sorted(
+            (e for e in self._guild_entries(ctx) if e["user_id"] == user_id),
+            key=lambda e: e["timestamp"],
+        )
+
+    async def _add_entry(self, entry):
+        if self.db:
+            await self.db.add(entry)
+            return
+        self.sessions.append(entry)
+        self._track_session(entry)
+        self._rollup_add(entry)
+        self.save_sessions()
+
+    async def _undo_last(self, ctx, user_id):
+        """Remove and return a user's most recent entry, or None."""
+        if self.db:
+            return await self.db.undo_last(self._scope_id(ctx), user_id)
+        mine = self._user_entries(ctx, user_id)
+        if not mine:
+            return None
+        last = mine[-1]
+        self.sessions.remove(last)
+        self._untrack_session(last)
+        self._rollup_remove(last)
+        self.save_sessions()
+        return last
+
+    async def _clear_guild(self, guild_id):
+        """Delete every entry in a guild; returns how many were removed."""
+        if self.db:
+            return await self.db.clear(guild_id)
+        before = len(self.sessions)
+        self.sessions = [s for s in self.sessions if s.get("guild_id") != guild_id]
+        removed = before - len(self.sessions)
+        self._rebuild_user_stats()
+        self._rebuild_rollups()
+        self.save_sessions()
+        return removed
+
+    async def _user_counts(self, ctx, user_id, since):
+        """A user's total sessions in scope, and how many were on since's day.
+
+        since must be a UTC midnight.
+        """
+        if self.db:
+            scope = self._scope_id(ctx)
+            total = await self.db.count(scope, user_id)
+            return total, await self.db.count(scope, user_id, since)
+        stats = self._scope_stats(ctx, user_id)
+        if not stats:
+            return 0, 0
+        day = self._to_dt(since).date().toordinal()
+        today_count = stats["counts"][-1] if stats["days"][-1] == day else 0
+        return stats["total"], today_count
+
+    async def _user_streak(self, ctx, user_id):
+        if self.db:
+            today = int(self._utcnow().timestamp() // 86400)
+            return await self.db.streak(self._scope_id(ctx), user_id, today)
+        return self._stats_streak(self._scope_stats(ctx, user_id))
+
+    async def _recent_entries(self, ctx, limit, user_id=None):
+        """The newest limit entries in scope, newest first."""
+        if self.db:
+            return await self.db.recent(self._scope_id(ctx), user_id, limit)
+        entries = self._guild_entries(ctx)
+        if user_id is not None:
+            entries = [e for e in entries if e["user_id"] == user_id]
+        return entries[-limit:][::-1]
+
+    async def _profile(self, ctx, user_id):
+        """Figures behind [p]myweed, or None if the user has no sessions."""
+        if self.db:
+            scope = self._scope_id(ctx)
+            profile = await self.db.profile(scope, user_id)
+            if profile is None:
+                return None
+            profile["best_day"] = EPOCH + datetime.timedelta(days=profile["best_day"])
+            profile["streak"] = await self._user_streak(ctx, user_id)
+            profile["methods"] = await self.db.method_totals(scope, user_id)
+            return profile
+
+        entries = self._user_entries(ctx, user_id)
+        if not entries:
+            return None
+        stats = self._scope_stats(ctx, user_id)
+        hours = [0] * 24
+        for e in entries:
+            hours[self._to_dt(e["timestamp"]).hour] += 1
+        best_day_count = max(stats["counts"])
+        best_day = datetime.date.fromordinal(
+            stats["days"][stats["counts"].index(best_day_count)]
+        )
+        # Per-method count + summed amount, kept in each method's own unit
+        # (units are never summed across methods).
+        methods = {}
+        for e in entries:
+            count, amount, has_amount = methods.get(e.get("method"), (0, 0.0, False))
+            if e.get("amount") is not None:
+                amount += e["amount"]
+                has_amount = True
+            methods[e.get("method")] = (count + 1, amount, has_amount)
+        return {
+            "total": stats["total"],
+            "first": entries[0]["timestamp"],
+            "last": entries[-1]["timestamp"],
+            "hours": hours,
+            "best_day": best_day,
+            "best_day_count": best_day_count,
+            "streak": self._stats_streak(stats),
+            "methods": methods,
+        }
+
+    async def _guild_stats(self, ctx, tz):
+        """Figures behind [p]weedstats, or None if nothing is logged."""
+        scope = self._scope_id(ctx)
+        week_ago = (self._utcnow() - datetime.timedelta(days=7)).timestamp()
+        if self.db:
+            total = await self.db.count(scope)
+            if not total:
+                return None
+            methods = await self.db.method_totals(scope)
+            return {
+                "total": total,
+                "leaders": await self.db.leaderboard(scope, 10),
+                "methods": {m: count for m, (count, _, _) in methods.items()},
+                "bins": self._fold_week(await self.db.hour_buckets(scope), tz),
+                "last7": await self.db.count(scope, since=week_ago),
+            }
+
+        rollup = self._rollups.get(scope)
+        if not rollup or not rollup["total"]:
+            return None
+        ranked = sorted(rollup["users"].items(), key=lambda x: x[1], reverse=True)
+        # Whole hourly buckets, so this can include up to an hour more than
+        # exactly seven days.
+        week_ago_hour = int(week_ago // 3600)
+        return {
+            "total": rollup["total"],
+            "leaders": [(rollup["names"][uid], c) for uid, c in ranked[:10]],
+            "methods": rollup["methods"],
+            "bins": self._fold_week(rollup["hours"].items(), tz),
+            "last7": sum(
+                n for hour, n in rollup["hours"].items() if hour >= week_ago_hour
+            ),
+        }
 
     # -- commands --------------------------------------------------------
 
@@ -239,8 +531,7 @@ class WeedTracker(commands.Cog):
             entry["amount"] = amount
         if note:
             entry["note"] = note
-        self.sessions.append(entry)
-        self.save_sessions()
+        await self._add_entry(entry)
 
         amount_str = self._fmt_amount(entry)
         detail = f" — {amount_str}" if amount_str else ""
@@ -251,21 +542,17 @@ class WeedTracker(commands.Cog):
         if note:
             lines.append(f"📝 Note: {note}")
 
-        # Milestones (per-guild, computed against this user's history).
-        mine = sorted(
-            (e for e in self._guild_entries(ctx) if e["user_id"] == ctx.author.id),
-            key=lambda e: e["timestamp"],
+        # Milestones (per-guild, from this user's running aggregates).
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        total, today_count = await self._user_counts(
+            ctx, ctx.author.id, midnight.timestamp()
         )
-        total = len(mine)
         if total in COUNT_MILESTONES:
             lines.append(f"🎉 Milestone: that's **{total}** sessions logged!")
 
         # Streak milestones fire once, on the first session of the day.
-        today_count = sum(
-            1 for e in mine if self._to_dt(e["timestamp"]).date() == now.date()
-        )
         if today_count == 1:
-            streak = self._current_streak([e["timestamp"] for e in mine])
+            streak = await self._user_streak(ctx, ctx.author.id)
             if streak in STREAK_MILESTONES:
                 lines.append(f"🔥 Streak milestone: **{streak}** days in a row!")
 
@@ -377,19 +664,53 @@ class WeedTracker(commands.Cog):
         )
         await ctx.send(embed=embed)
 
+    @weed.command(name="backend")
+    @commands.is_owner()
+    async def weed_backend(self, ctx, backend: Optional[str] = None):
+        """Show the storage backend, or move session logs into SQLite.
+
+        `[p]weed backend sqlite` copies every logged session into weed.db
+        once and keeps the old weed.json as weed.json.migrated.
+        """
+        current = "sqlite" if self.db else "json"
+        if backend is None:
+            await ctx.send(f"🗄️ Session logs are stored in **{current}**.")
+            return
+        backend = backend.strip().lower()
+        if backend == current:
+            await ctx.send(f"🗄️ Session logs are already stored in **{current}**.")
+            return
+        if backend != "sqlite":
+            await ctx.send("❌ Session logs can only be moved from `json` to `sqlite`.")
+            return
+
+        db = WeedDB(self.db_path)
+        if await db.count(None):
+            db.close()
+            await ctx.send("❌ weed.db already holds session logs; not migrating over them.")
+            return
+
+        # Keep weed.json as a backup, then route new logs to SQLite before
+        # copying the history across.
+        self.save_sessions()
+        os.replace(self.file_path, self.file_path + ".migrated")
+        entries, self.sessions = self.sessions, []
+        self._user_stats, self._rollups = {}, {}
+        self.db = db
+        self.settings["backend"] = "sqlite"
+        self.save_settings()
+        migrated = await db.migrate(entries)
+        await ctx.send(
+            f"✅ Moved {migrated} session log entr{'y' if migrated == 1 else 'ies'} into SQLite."
+        )
+
     @weed.command(name="undo")
     async def weed_undo(self, ctx):
         """Remove your most recent session log entry."""
-        mine = sorted(
-            (e for e in self._guild_entries(ctx) if e["user_id"] == ctx.author.id),
-            key=lambda e: e["timestamp"],
-        )
-        if not mine:
+        last = await self._undo_last(ctx, ctx.author.id)
+        if last is None:
             await ctx.send("You have no sessions to undo. 🌿")
             return
-        last = mine[-1]
-        self.sessions.remove(last)
-        self.save_sessions()
         await ctx.send(
             f"↩️ Removed your session logged at {self._fmt(last['timestamp'])}."
         )
@@ -399,10 +720,7 @@ class WeedTracker(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def weedclear(self, ctx):
         """Clear all session logs for this server (admin only)."""
-        before = len(self.sessions)
-        self.sessions = [s for s in self.sessions if s.get("guild_id") != ctx.guild.id]
-        removed = before - len(self.sessions)
-        self.save_sessions()
+        removed = await self._clear_guild(ctx.guild.id)
         await ctx.send(
             f"🧹 Cleared {removed} session log entr{'y' if removed == 1 else 'ies'}."
         )
@@ -414,16 +732,12 @@ class WeedTracker(commands.Cog):
         """Show recent session log entries, optionally for one user."""
         limit = max(1, min(limit, 25))
 
-        entries = self._guild_entries(ctx)
-        if member:
-            entries = [e for e in entries if e["user_id"] == member.id]
-
-        if not entries:
+        recent = await self._recent_entries(ctx, limit, member.id if member else None)
+        if not recent:
             who = member.display_name if member else "anyone"
             await ctx.send(f"No sessions logged for {who} yet. 🌿")
             return
 
-        recent = entries[-limit:][::-1]
         title = (
             f"🌿 Recent Sessions — {member.display_name}"
             if member
@@ -452,21 +766,17 @@ class WeedTracker(commands.Cog):
     async def myweed(self, ctx, member: Optional[discord.Member] = None):
         """Show a session profile for yourself or another user."""
         member = member or ctx.author
-        entries = sorted(
-            (e for e in self._guild_entries(ctx) if e["user_id"] == member.id),
-            key=lambda e: e["timestamp"],
-        )
-        if not entries:
+        profile = await self._profile(ctx, member.id)
+        if profile is None:
             await ctx.send(f"{member.display_name} hasn't logged any sessions yet. 🌿")
             return
 
-        timestamps = [e["timestamp"] for e in entries]
-        total = len(timestamps)
-        first, last = timestamps[0], timestamps[-1]
+        total = profile["total"]
+        first, last = profile["first"], profile["last"]
 
         if total > 1:
-            gaps = [b - a for a, b in zip(timestamps, timestamps[1:])]
-            avg_gap = humanize_timedelta(seconds=int(sum(gaps) / len(gaps)))
+            # The mean of consecutive gaps telescopes to the overall span.
+            avg_gap = humanize_timedelta(seconds=int((last - first) / (total - 1)))
             avg_str = avg_gap or "less than a second"
         else:
             avg_str = "N/A (need 2+ sessions)"
@@ -474,39 +784,24 @@ class WeedTracker(commands.Cog):
         since_last = humanize_timedelta(
             seconds=int(self._utcnow().timestamp() - last)
         )
-        streak = self._current_streak(timestamps)
-
-        hour_counts = [0] * 24
-        day_counts = {}
-        for ts in timestamps:
-            dt = self._to_dt(ts)
-            hour_counts[dt.hour] += 1
-            day_counts[dt.date()] = day_counts.get(dt.date(), 0) + 1
+        streak = profile["streak"]
+
+        hour_counts = profile["hours"]
         busiest_hour = hour_counts.index(max(hour_counts))
-        best_day, best_day_count = max(day_counts.items(), key=lambda x: x[1])
+        best_day, best_day_count = profile["best_day"], profile["best_day_count"]
 
-        # Per-method breakdown: count + summed amount, kept in each method's
-        # own unit (units are never summed across methods).
-        by_method = {}
-        for e in entries:
-            rec = by_method.setdefault(
-                e.get("method"), {"count": 0, "amount": 0.0, "has_amount": False}
-            )
-            rec["count"] += 1
-            if e.get("amount") is not None:
-                rec["amount"] += e["amount"]
-                rec["has_amount"] = True
+        # Per-method breakdown: count + summed amount, in each method's unit.
         breakdown_lines = []
         for key, meta in METHODS.items():
-            rec = by_method.get(key)
-            if not rec:
+            if key not in profile["methods"]:
                 continue
+            count, amount, has_amount = profile["methods"][key]
             line = (
-                f"{meta['emoji']} {meta['label']}: {rec['count']} "
-                f"session{'s' if rec['count'] != 1 else ''}"
+                f"{meta['emoji']} {meta['label']}: {count} "
+                f"session{'s' if count != 1 else ''}"
             )
-            if rec["has_amount"]:
-                line += f" · {rec['amount']:g} {meta['unit']}"
+            if has_amount:
+                line += f" · {amount:g} {meta['unit']}"
             breakdown_lines.append(line)
 
         embed = discord.Embed(
@@ -548,36 +843,22 @@ class WeedTracker(commands.Cog):
     @commands.command(name="weedstats")
     async def weedstats(self, ctx):
         """Show the session leaderboard and server activity analytics."""
-        entries = self._guild_entries(ctx)
-        if not entries:
-            await ctx.send("No sessions logged yet. 🌿")
-            return
-
         # Bucket weekday/hour in the guild's configured timezone so a session
         # logged at 8 PM Saturday local doesn't roll into Sunday on UTC.
         tz = self._guild_tz(ctx.guild)
         tz_name = self._guild_tz_name(ctx.guild)
 
-        counts, names = {}, {}
-        weekday_counts = [0] * 7
-        hour_counts = [0] * 24
-        method_counts = {key: 0 for key in METHODS}
-        week_ago = (self._utcnow() - datetime.timedelta(days=7)).timestamp()
-        last7 = 0
+        stats = await self._guild_stats(ctx, tz)
+        if stats is None:
+            await ctx.send("No sessions logged yet. 🌿")
+            return
+
+        method_counts = {key: stats["methods"].get(key, 0) for key in METHODS}
+        bins = stats["bins"]
+        weekday_counts = [sum(bins[d * 24:(d + 1) * 24]) for d in range(7)]
+        hour_counts = [sum(bins[h::24]) for h in range(24)]
+        last7 = stats["last7"]
 
-        for e in entries:
-            uid = e["user_id"]
-            counts[uid] = counts.get(uid, 0) + 1
-            names[uid] = e.get("user_name", f"User {uid}")
-            if e.get("method") in method_counts:
-                method_counts[e["method"]] += 1
-            dt = self._to_dt(e["timestamp"]).astimezone(tz)
-            weekday_counts[dt.weekday()] += 1
-            hour_counts[dt.hour] += 1
-            if e["timestamp"] >= week_ago:
-                last7 += 1
-
-        ranked = sorted(counts.items(), key=lambda x: x[1], reverse=True)
         busiest_day = WEEKDAY_NAMES[weekday_counts.index(max(weekday_counts))]
         busiest_hour = hour_counts.index(max(hour_counts))
         # Plain-text hour in the guild's TZ so it matches the chart's bucketing
@@ -598,8 +879,8 @@ class WeedTracker(commands.Cog):
             title="🏆 Session Leaderboard", color=discord.Color.green()
         )
         embed.description = "\n".join(
-            f"{i}. {names[uid]} — {c} session{'s' if c != 1 else ''}"
-            for i, (uid, c) in enumerate(ranked[:10], start=1)
+            f"{i}. {name} — {c} session{'s' if c != 1 else ''}"
+            for i, (name, c) in enumerate(stats["leaders"], start=1)
         )
         embed.add_field(
             name="📅 Activity by Weekday",
@@ -614,7 +895,7 @@ class WeedTracker(commands.Cog):
         embed.add_field(
             name="📊 Summary",
             value=(
-                f"Total sessions: **{len(entries)}**\n"
+                f"Total sessions: **{stats['total']}**\n"
                 f"Last 7 days: **{last7}**\n"
                 f"Busiest day: **{busiest_day}**\n"
                 f"Busiest hour: **{busiest_hour_str}**"
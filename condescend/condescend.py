@@ -1,8 +1,26 @@
 import discord
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict, deque
 from redbot.core import commands, Config
 from openai import AsyncOpenAI
 import google.generativeai as genai
 
+HISTORY_LENGTH = 6          # Messages of context kept per channel
+HISTORY_CACHE_SIZE = 256    # Channels whose history is kept in memory
+HISTORY_FLUSH_INTERVAL = 30 # Seconds between writes of changed histories to Config
+STREAM_EDIT_INTERVAL = 1.0  # Minimum seconds between edits of a streamed reply
+LATENCY_SAMPLES = 100       # Recent time-to-first-reply samples kept
+RATE_LIMIT_RETRIES = 3      # Retries of a provider call answered with HTTP 429
+RATE_LIMIT_BACKOFF = 2.0    # First retry delay in seconds, doubled each time
+RESPONSE_CACHE_SIZE = 256   # Replies kept by the response cache
+RESPONSE_CACHE_TTL = 600    # Seconds a cached reply may be reused
+# Trailing history messages (the last exchange) that are part of a cache
+# key, so a reply is only reused where the conversation led up to it too.
+RESPONSE_CACHE_CONTEXT = 2
+
 class Condescend(commands.Cog):
     """
     A cog that replies condescendingly, supporting OpenAI (ChatGPT/Ollama) and Google (Gemini).
@@ -19,6 +37,9 @@ class Condescend(commands.Cog):
             "base_url": None,         # For Ollama
             "model": "gpt-3.5-turbo", # Default OpenAI model
             "gemini_model": "gemini-1.5-flash", # Default Gemini model
+            "stream": False,          # Post partial replies and edit them as tokens arrive
+            "max_concurrent": 4,      # Provider requests allowed in flight at once
+            "response_cache": False,  # Reuse recent replies to identical prompts
             "system_prompt": (
                 "You are a highly intelligent but incredibly arrogant and condescending AI assistant. "
                 "You are replying to a Discord user. Keep your response short, witty, and biting. "
@@ -32,26 +53,168 @@ class Condescend(commands.Cog):
         }
         self.config.register_channel(**default_channel)
 
-        self.client = None # OpenAI Client
+        self._settings = None      # Cached global config, cleared by the setters
+        self._clients = {}         # (provider, model, key, ...) -> client/model
+        self._gemini_key = None    # Key genai is currently configured with
+        self._histories = OrderedDict()  # channel_id -> history, LRU order
+        self._dirty = set()        # channel_ids whose history isn't in Config yet
+        self._first_reply_times = deque(maxlen=LATENCY_SAMPLES)  # Mention -> first text posted
+        # Requests run one at a time per channel (so each sees the previous
+        # reply in its history) and at most max_concurrent at once overall.
+        self._channel_locks = {}   # channel_id -> asyncio.Lock
+        self._queued = {}          # channel_id -> requests waiting or running
+        self._slots = asyncio.Semaphore(default_global["max_concurrent"])
+        self._slot_limit = default_global["max_concurrent"]
+        self._in_flight = 0
+        self._stats = {"requests": 0, "errors": 0, "rate_limited": 0, "max_depth": 0}
+        self._responses = OrderedDict()  # cache key -> (expires, reply text), LRU order
+        self._cache_stats = {"hits": 0, "misses": 0}
+        self._wait_times = deque(maxlen=LATENCY_SAMPLES)   # Mention -> request started
+        self._total_times = deque(maxlen=LATENCY_SAMPLES)  # Mention -> reply finished
+        self._flush_task = self.bot.loop.create_task(self._flush_loop())
+
+    async def cog_unload(self):
+        self._flush_task.cancel()
+        await self._flush_histories()
+
+    # --- CACHED STATE ---
 
-    async def _init_openai(self):
-        """Initializes the OpenAI client."""
-        api_key = await self.config.api_key()
-        base_url = await self.config.base_url()
+    async def _get_settings(self):
+        """Global config, read once and reused until a setter changes it."""
+        if self._settings is None:
+            self._settings = await self.config.all()
+            if self._settings["max_concurrent"] != self._slot_limit:
+                # Requests already holding a slot release it to the old semaphore
+                self._slot_limit = self._settings["max_concurrent"]
+                self._slots = asyncio.Semaphore(self._slot_limit)
+        return self._settings
+
+    def _invalidate(self):
+        self._settings = None
+        self._clients.clear()
+        self._responses.clear()
+
+    def _openai_client(self, settings):
+        """Shared OpenAI/Ollama client for the configured key and endpoint."""
+        api_key = settings["api_key"]
+        base_url = settings["base_url"]
         
         if base_url and not api_key:
             api_key = "ollama" 
 
-        if api_key:
+        if not api_key:
+            return None
+        key = ("openai", settings["model"], api_key, base_url)
+        client = self._clients.get(key)
+        if client is None:
             if base_url:
-                self.client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+                client = AsyncOpenAI(api_key=api_key, base_url=base_url)
             else:
-                self.client = AsyncOpenAI(api_key=api_key)
+                client = AsyncOpenAI(api_key=api_key)
+            self._clients[key] = client
+        return client
+
+    def _gemini_model(self, settings):
+        """Shared Gemini model for the configured key, model and persona."""
+        api_key = settings["gemini_key"]
+        key = ("google", settings["gemini_model"], api_key, settings["system_prompt"])
+        model = self._clients.get(key)
+        if model is None:
+            # genai.configure is process-wide, so only redo it when the key changes
+            if self._gemini_key != api_key:
+                genai.configure(api_key=api_key)
+                self._gemini_key = api_key
+            model = genai.GenerativeModel(
+                model_name=settings["gemini_model"],
+                system_instruction=settings["system_prompt"]
+            )
+            self._clients[key] = model
+        return model
+
+    async def _get_history(self, channel_id):
+        history = self._histories.get(channel_id)
+        if history is None:
+            history = await self.config.channel_from_id(channel_id).history()
+            await self._cache_history(channel_id, history)
+        else:
+            self._histories.move_to_end(channel_id)
+        return history
+
+    async def _set_history(self, channel_id, history):
+        """Update a channel's history in memory; Config catches up on the next flush."""
+        await self._cache_history(channel_id, history)
+        self._dirty.add(channel_id)
+
+    async def _cache_history(self, channel_id, history):
+        self._histories[channel_id] = history
+        self._histories.move_to_end(channel_id)
+        while len(self._histories) > HISTORY_CACHE_SIZE:
+            old_id, old_history = self._histories.popitem(last=False)
+            if old_id in self._dirty:
+                self._dirty.discard(old_id)
+                await self.config.channel_from_id(old_id).history.set(old_history)
+
+    async def _flush_histories(self):
+        dirty, self._dirty = self._dirty, set()
+        for channel_id in dirty:
+            history = self._histories.get(channel_id)
+            if history is not None:
+                await self.config.channel_from_id(channel_id).history.set(history)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(HISTORY_FLUSH_INTERVAL)
+            try:
+                await self._flush_histories()
+            except Exception as e:
+                print(f"Error saving history: {e}")
+
+    @staticmethod
+    def _normalize(text):
+        """Case, spacing and trailing punctuation don't make a prompt different."""
+        return " ".join(text.lower().split()).rstrip("?!. ")
+
+    @staticmethod
+    def _digest(value):
+        return hashlib.sha1(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+    def _cache_key(self, settings, history, author, prompt):
+        # The reply is addressed to the author by name, so it is theirs alone.
+        provider = settings["provider"]
+        model = settings["gemini_model"] if provider == "google" else settings["model"]
+        context = history[-RESPONSE_CACHE_CONTEXT:] if RESPONSE_CACHE_CONTEXT else []
+        return (
+            provider, model, self._digest(settings["system_prompt"]),
+            author, prompt, self._digest(context),
+        )
+
+    def _cache_get(self, key):
+        entry = self._responses.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._responses.move_to_end(key)
+            self._cache_stats["hits"] += 1
+            return entry[1]
+        if entry is not None:
+            del self._responses[key]
+        self._cache_stats["misses"] += 1
+        return None
+
+    def _cache_put(self, key, reply_text):
+        self._responses[key] = (time.monotonic() + RESPONSE_CACHE_TTL, reply_text)
+        self._responses.move_to_end(key)
+        while len(self._responses) > RESPONSE_CACHE_SIZE:
+            self._responses.popitem(last=False)
+
+    def _hit_rate(self):
+        lookups = self._cache_stats["hits"] + self._cache_stats["misses"]
+        if not lookups:
+            return "n/a"
+        return f"{self._cache_stats['hits'] / lookups:.0%} of {lookups}"
 
     @commands.Cog.listener()
     async def on_red_api_tokens_update(self, service_name, api_tokens):
         if service_name == "openai":
-            await self._init_openai()
+            self._invalidate()
 
     # --- CONFIGURATION COMMANDS ---
 
@@ -67,6 +230,7 @@ class Condescend(commands.Cog):
             return
         
         await self.config.provider.set(provider.lower())
+        self._invalidate()
         await ctx.send(f"Provider switched to **{provider.upper()}**.")
 
     @commands.command()
@@ -74,7 +238,7 @@ class Condescend(commands.Cog):
     async def setopenai(self, ctx, key: str):
         """Set OpenAI API key."""
         await self.config.api_key.set(key)
-        await self._init_openai()
+        self._invalidate()
         await ctx.send("OpenAI key updated.")
         try:
             await ctx.message.delete()
@@ -85,6 +249,7 @@ class Condescend(commands.Cog):
     async def setgemini(self, ctx, key: str):
         """Set Google Gemini API key."""
         await self.config.gemini_key.set(key)
+        self._invalidate()
         await ctx.send("Gemini key updated.")
         try:
             await ctx.message.delete()
@@ -96,11 +261,11 @@ class Condescend(commands.Cog):
         """Set custom URL for Ollama (used only if provider is 'openai')."""
         if url and url.lower() == "clear":
             await self.config.base_url.set(None)
-            await self._init_openai()
+            self._invalidate()
             await ctx.send("Custom URL cleared.")
             return
         await self.config.base_url.set(url)
-        await self._init_openai()
+        self._invalidate()
         await ctx.send(f"Endpoint URL set to `{url}`.")
 
     @commands.command()
@@ -108,6 +273,7 @@ class Condescend(commands.Cog):
     async def setpersona(self, ctx, *, prompt: str):
         """Update the system persona."""
         await self.config.system_prompt.set(prompt)
+        self._invalidate()
         await ctx.send("Persona updated.")
 
     @commands.command()
@@ -116,19 +282,92 @@ class Condescend(commands.Cog):
         """
         Set the model name (updates whichever provider is currently active).
         """
-        provider = await self.config.provider()
+        provider = (await self._get_settings())["provider"]
         if provider == "google":
             await self.config.gemini_model.set(model_name)
+            self._invalidate()
             await ctx.send(f"Gemini model set to `{model_name}`.")
         else:
             await self.config.model.set(model_name)
+            self._invalidate()
             await ctx.send(f"OpenAI/Ollama model set to `{model_name}`.")
 
+    @commands.command()
+    @commands.is_owner()
+    async def setstream(self, ctx, enabled: bool = None):
+        """
+        Toggle streaming replies (posted early, then edited as the model writes).
+        Without an argument, shows the current mode and recent time to first reply.
+        """
+        if enabled is None:
+            enabled = (await self._get_settings())["stream"]
+            msg = f"Streaming is **{'on' if enabled else 'off'}**."
+            if self._first_reply_times:
+                avg = sum(self._first_reply_times) / len(self._first_reply_times)
+                msg += f" Average time to first reply: **{avg:.2f}s** (last {len(self._first_reply_times)})."
+            await ctx.send(msg)
+            return
+        await self.config.stream.set(enabled)
+        self._invalidate()
+        await ctx.send(f"Streaming replies {'enabled' if enabled else 'disabled'}.")
+
+    @commands.command()
+    @commands.is_owner()
+    async def setconcurrency(self, ctx, limit: int):
+        """Set how many AI requests may run at once across all channels."""
+        if limit < 1:
+            await ctx.send("Limit must be at least 1.")
+            return
+        await self.config.max_concurrent.set(limit)
+        self._invalidate()
+        await ctx.send(f"Up to **{limit}** requests will run at once.")
+
+    @commands.command()
+    @commands.is_owner()
+    async def setcache(self, ctx, enabled: bool = None):
+        """
+        Toggle reusing recent replies when the same prompt comes in again.
+        Cached replies are shared between users and channels.
+        """
+        if enabled is None:
+            enabled = (await self._get_settings())["response_cache"]
+            await ctx.send(
+                f"Response cache is **{'on' if enabled else 'off'}** "
+                f"({len(self._responses)} cached, hit rate {self._hit_rate()})."
+            )
+            return
+        await self.config.response_cache.set(enabled)
+        self._invalidate()
+        await ctx.send(f"Response cache {'enabled' if enabled else 'disabled'}.")
+
+    @commands.command()
+    @commands.is_owner()
+    async def condescendstats(self, ctx):
+        """Show request queue depth, latency and rate limiting."""
+        def avg(samples):
+            return f"{sum(samples) / len(samples):.2f}s" if samples else "n/a"
+
+        waiting = sum(self._queued.values()) - self._in_flight
+        embed = discord.Embed(title="Condescend Requests", color=discord.Color.blue())
+        embed.add_field(name="In Flight", value=f"{self._in_flight}/{self._slot_limit}", inline=True)
+        embed.add_field(name="Queued", value=f"{waiting} ({len(self._queued)} channels)", inline=True)
+        embed.add_field(name="Max Depth", value=str(self._stats["max_depth"]), inline=True)
+        embed.add_field(name="Requests", value=str(self._stats["requests"]), inline=True)
+        embed.add_field(name="Errors", value=str(self._stats["errors"]), inline=True)
+        embed.add_field(name="429 Retries", value=str(self._stats["rate_limited"]), inline=True)
+        embed.add_field(name="Avg Queue Wait", value=avg(self._wait_times), inline=True)
+        embed.add_field(name="Avg First Reply", value=avg(self._first_reply_times), inline=True)
+        embed.add_field(name="Avg Total", value=avg(self._total_times), inline=True)
+        embed.add_field(name="Cache Hit Rate", value=self._hit_rate(), inline=True)
+        await ctx.send(embed=embed)
+
     @commands.command()
     @commands.admin_or_permissions(manage_messages=True)
     async def forget(self, ctx):
         """Wipes memory."""
         await self.config.channel(ctx.channel).history.set([])
+        self._histories.pop(ctx.channel.id, None)
+        self._dirty.discard(ctx.channel.id)
         await ctx.send("Memory wiped.")
 
     # --- MAIN LOGIC ---
@@ -156,91 +395,215 @@ class Condescend(commands.Cog):
                     f"CONTEXT: User '{original_author}' said: \"{original_text}\"\n"
                     f"User '{my_author}' (replying to them) said to YOU: \"{user_text}\"\n"
                 )
+                cache_prompt = (
+                    f"{original_author}\n{self._normalize(original_text)}\n{self._normalize(user_text)}"
+                )
             else:
                 current_interaction_text = (
                     f"User '{my_author}' said to YOU: \"{user_text}\"\n"
                 )
+                cache_prompt = self._normalize(user_text)
         except:
             return 
 
+        started = time.monotonic()
+        channel_id = message.channel.id
+        lock = self._channel_locks.setdefault(channel_id, asyncio.Lock())
+        self._queued[channel_id] = self._queued.get(channel_id, 0) + 1
+        self._stats["max_depth"] = max(self._stats["max_depth"], sum(self._queued.values()))
+        try:
+            async with lock:
+                settings = await self._get_settings()  # Also picks up a changed max_concurrent
+                cache_key = None
+                if settings["response_cache"]:
+                    # Served locally without taking a provider slot
+                    history = await self._get_history(channel_id)
+                    cache_key = self._cache_key(settings, history, my_author, cache_prompt)
+                    cached = self._cache_get(cache_key)
+                    if cached is not None:
+                        await self._respond(message, current_interaction_text, my_author, started, cached=cached)
+                        return
+                async with self._slots:
+                    self._in_flight += 1
+                    self._wait_times.append(time.monotonic() - started)
+                    try:
+                        await self._respond(message, current_interaction_text, my_author, started, cache_key=cache_key)
+                    finally:
+                        self._in_flight -= 1
+        finally:
+            self._queued[channel_id] -= 1
+            if not self._queued[channel_id]:
+                del self._queued[channel_id]
+                del self._channel_locks[channel_id]
+            self._total_times.append(time.monotonic() - started)
+
+    async def _respond(self, message, current_interaction_text, my_author, started, cache_key=None, cached=None):
+        self._stats["requests"] += 1
         async with message.channel.typing():
             try:
-                provider = await self.config.provider()
-                system_prompt = await self.config.system_prompt()
-                history = await self.config.channel(message.channel).history()
-                reply_text = ""
-
-                # --- GOOGLE GEMINI LOGIC ---
-                if provider == "google":
-                    api_key = await self.config.gemini_key()
-                    if not api_key:
+                settings = await self._get_settings()
+                history = await self._get_history(message.channel.id)
+
+                if settings["provider"] == "google":
+                    if not settings["gemini_key"]:
                         await message.reply("❌ Gemini API Key not set. Use `[p]setgemini`.")
                         return
-
-                    model_name = await self.config.gemini_model()
-                    genai.configure(api_key=api_key)
-                    
-                    # Gemini System Prompt
-                    model = genai.GenerativeModel(
-                        model_name=model_name,
-                        system_instruction=system_prompt
-                    )
-
-                    # Convert History to Gemini Format (user/model)
-                    gemini_history = []
-                    for msg in history:
-                        role = "user" if msg['role'] == "user" else "model"
-                        gemini_history.append({"role": role, "parts": [msg['content']]})
-
-                    chat = model.start_chat(history=gemini_history)
-                    response = await chat.send_message_async(current_interaction_text)
-                    reply_text = response.text
-
-                # --- OPENAI / OLLAMA LOGIC ---
-                else:
-                    if not self.client:
-                        await self._init_openai()
-                        if not self.client: return
-
-                    model = await self.config.model()
-                    messages_payload = []
-                    
-                    # OpenAI Formatting
-                    is_o1 = model.startswith("o1")
-                    token_arg_name = "max_completion_tokens" if is_o1 else "max_tokens"
-
-                    if is_o1:
-                        history_text = "\n".join([f"{msg['role'].upper()}: {msg['content']}" for msg in history])
-                        full_content = (
-                            f"{system_prompt}\n\n--- PREVIOUS HISTORY ---\n{history_text}\n"
-                            f"--- CURRENT ---\n{current_interaction_text}\nINSTRUCTION: Reply to '{my_author}'."
-                        )
-                        messages_payload.append({"role": "user", "content": full_content})
-                    else:
-                        messages_payload.append({"role": "system", "content": system_prompt})
-                        for msg in history:
-                            messages_payload.append(msg)
-                        messages_payload.append({"role": "user", "content": current_interaction_text})
-
-                    api_args = {
-                        "model": model,
-                        "messages": messages_payload,
-                        token_arg_name: 300
-                    }
-                    response = await self.client.chat.completions.create(**api_args)
-                    reply_text = response.choices[0].message.content
+                elif not self._openai_client(settings):
+                    return
 
                 # --- SEND & SAVE ---
-                await message.reply(reply_text, mention_author=True)
+                if cached is not None:
+                    chunks = self._replay(cached)
+                else:
+                    chunks = self._generate(settings, history, current_interaction_text, my_author)
+                reply_text = await self._send_reply(message, chunks, started)
+                if cache_key is not None and reply_text:
+                    self._cache_put(cache_key, reply_text)
 
                 new_history_entries = [
                     {"role": "user", "content": current_interaction_text},
                     {"role": "assistant", "content": reply_text}
                 ]
-                history.extend(new_history_entries)
-                if len(history) > 6: history = history[-6:]
-                await self.config.channel(message.channel).history.set(history)
+                history = (history + new_history_entries)[-HISTORY_LENGTH:]
+                await self._set_history(message.channel.id, history)
 
             except Exception as e:
+                self._stats["errors"] += 1
                 await message.reply(f"❌ **Error:** {str(e)}", mention_author=True)
                 print(f"Error: {e}")
+
+    @staticmethod
+    def _retry_after(error):
+        """
+        Seconds to wait if error is a provider 429, else None. Uses the
+        Retry-After header when the provider sent one.
+        """
+        status = getattr(error, "status_code", None) or getattr(error, "code", None)
+        if status != 429:
+            return None
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return 0.0
+
+    async def _with_backoff(self, call):
+        """Run a provider request, backing off and retrying when rate limited."""
+        delay = RATE_LIMIT_BACKOFF
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                return await call()
+            except Exception as e:
+                retry_after = self._retry_after(e)
+                if retry_after is None or attempt == RATE_LIMIT_RETRIES:
+                    raise
+            self._stats["rate_limited"] += 1
+            await asyncio.sleep(max(retry_after, delay))
+            delay *= 2
+
+    async def _generate(self, settings, history, current_interaction_text, my_author):
+        """
+        Yield the reply text. With streaming on this is a piece per chunk as
+        the provider sends it; otherwise the whole reply at once.
+        """
+        stream = settings["stream"]
+        system_prompt = settings["system_prompt"]
+
+        # --- GOOGLE GEMINI LOGIC ---
+        if settings["provider"] == "google":
+            # Gemini System Prompt is baked into the cached model
+            model = self._gemini_model(settings)
+
+            # Convert History to Gemini Format (user/model)
+            gemini_history = []
+            for msg in history:
+                role = "user" if msg['role'] == "user" else "model"
+                gemini_history.append({"role": role, "parts": [msg['content']]})
+
+            chat = model.start_chat(history=gemini_history)
+            if stream:
+                response = await self._with_backoff(
+                    lambda: chat.send_message_async(current_interaction_text, stream=True)
+                )
+                async for chunk in response:
+                    yield chunk.text
+            else:
+                response = await self._with_backoff(
+                    lambda: chat.send_message_async(current_interaction_text)
+                )
+                yield response.text
+
+        # --- OPENAI / OLLAMA LOGIC ---
+        else:
+            client = self._openai_client(settings)
+            model = settings["model"]
+            messages_payload = []
+            
+            # OpenAI Formatting
+            is_o1 = model.startswith("o1")
+            token_arg_name = "max_completion_tokens" if is_o1 else "max_tokens"
+
+            if is_o1:
+                history_text = "\n".join([f"{msg['role'].upper()}: {msg['content']}" for msg in history])
+                full_content = (
+                    f"{system_prompt}\n\n--- PREVIOUS HISTORY ---\n{history_text}\n"
+                    f"--- CURRENT ---\n{current_interaction_text}\nINSTRUCTION: Reply to '{my_author}'."
+                )
+                messages_payload.append({"role": "user", "content": full_content})
+            else:
+                messages_payload.append({"role": "system", "content": system_prompt})
+                for msg in history:
+                    messages_payload.append(msg)
+                messages_payload.append({"role": "user", "content": current_interaction_text})
+
+            api_args = {
+                "model": model,
+                "messages": messages_payload,
+                token_arg_name: 300
+            }
+            if stream:
+                response = await self._with_backoff(
+                    lambda: client.chat.completions.create(**api_args, stream=True)
+                )
+                async for chunk in response:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            else:
+                response = await self._with_backoff(
+                    lambda: client.chat.completions.create(**api_args)
+                )
+                yield response.choices[0].message.content
+
+    @staticmethod
+    async def _replay(text):
+        yield text
+
+    async def _send_reply(self, message, chunks, started):
+        """
+        Reply with the first text as soon as it arrives, then edit the reply
+        at most every STREAM_EDIT_INTERVAL as more comes in. Returns the full text.
+        """
+        reply_text = ""
+        sent = None
+        shown = ""
+        last_edit = 0.0
+        async for piece in chunks:
+            reply_text += piece
+            if not reply_text.strip():
+                continue
+            now = time.monotonic()
+            if sent is None:
+                sent = await message.reply(reply_text, mention_author=True)
+                self._first_reply_times.append(now - started)
+                shown, last_edit = reply_text, now
+            elif now - last_edit >= STREAM_EDIT_INTERVAL:
+                await sent.edit(content=reply_text)
+                shown, last_edit = reply_text, now
+
+        if sent is None:
+            await message.reply(reply_text or "...", mention_author=True)
+            self._first_reply_times.append(time.monotonic() - started)
+        elif shown != reply_text:
+            await sent.edit(content=reply_text)
+        return reply_text
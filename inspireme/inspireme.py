@@ -1,3 +1,6 @@
+import asyncio
+from collections import deque
+
 import aiohttp
 import discord
 from redbot.core import commands
@@ -7,38 +10,80 @@ class InspireMe(commands.Cog):
     """Generate inspirational quote images from InspiroBot."""
 
     API_URL = "https://inspirobot.me/api"
+    # Image URLs kept ready so the command doesn't wait on InspiroBot.
+    POOL_SIZE = 5
+    FETCH_TIMEOUT = 10
+    # Refill backoff while InspiroBot is failing, in seconds.
+    BACKOFF_MIN = 2
+    BACKOFF_MAX = 300
 
     def __init__(self, bot):
         self.bot = bot
-        self.session = aiohttp.ClientSession()
+        self.session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self.FETCH_TIMEOUT)
+        )
+        self.pool = deque()
+        self._consumed = asyncio.Event()
+        self._refill_task = self.bot.loop.create_task(self.refill_loop())
 
     def cog_unload(self):
-        # Close the HTTP session when the cog is unloaded.
+        # Stop prefetching and close the HTTP session when the cog is unloaded.
+        self._refill_task.cancel()
         self.bot.loop.create_task(self.session.close())
 
+    async def fetch_image_url(self):
+        """Ask InspiroBot for a new image URL.
+
+        Raises aiohttp.ClientError (ClientResponseError for a non-2xx
+        status), asyncio.TimeoutError, or ValueError if the body isn't a URL.
+        """
+        async with self.session.get(self.API_URL, params={"generate": "true"}) as resp:
+            resp.raise_for_status()
+            image_url = (await resp.text()).strip()
+        if not image_url.startswith("http"):
+            raise ValueError(f"not an image URL: {image_url[:100]!r}")
+        return image_url
+
+    async def refill_loop(self):
+        """Keep the pool topped up, backing off while InspiroBot is failing."""
+        backoff = self.BACKOFF_MIN
+        while True:
+            if len(self.pool) >= self.POOL_SIZE:
+                self._consumed.clear()
+                await self._consumed.wait()
+                continue
+            try:
+                self.pool.append(await self.fetch_image_url())
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.BACKOFF_MAX)
+            else:
+                backoff = self.BACKOFF_MIN
+
     @commands.command(name="inspireme", aliases=["inspire"])
     @commands.cooldown(1, 5, commands.BucketType.user)
     async def inspireme(self, ctx):
         """Generate an inspirational quote from InspiroBot."""
-        async with ctx.typing():
-            try:
-                async with self.session.get(
-                    self.API_URL, params={"generate": "true"}
-                ) as resp:
-                    if resp.status != 200:
-                        await ctx.send(
-                            f"❌ InspiroBot returned an error (HTTP {resp.status}). "
-                            "Try again later."
-                        )
-                        return
-                    image_url = (await resp.text()).strip()
-            except aiohttp.ClientError as exc:
-                await ctx.send(f"❌ Couldn't reach InspiroBot: {exc}")
-                return
-
-        if not image_url.startswith("http"):
-            await ctx.send("❌ InspiroBot didn't return a valid image. Try again.")
-            return
+        if self.pool:
+            image_url = self.pool.popleft()
+            self._consumed.set()
+        else:
+            # Pool ran dry (e.g. InspiroBot has been down); try a live call.
+            async with ctx.typing():
+                try:
+                    image_url = await self.fetch_image_url()
+                except aiohttp.ClientResponseError as exc:
+                    await ctx.send(
+                        f"❌ InspiroBot returned an error (HTTP {exc.status}). "
+                        "Try again later."
+                    )
+                    return
+                except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    await ctx.send(f"❌ Couldn't reach InspiroBot: {exc}")
+                    return
+                except ValueError:
+                    await ctx.send("❌ InspiroBot didn't return a valid image. Try again.")
+                    return
 
         embed = discord.Embed(color=await ctx.embed_color())
         embed.set_image(url=image_url)
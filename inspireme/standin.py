@@ -0,0 +1,89 @@
+"""Check InspireMe's image pool against a local stand-in for InspiroBot.
+
+Starts a tiny aiohttp server that hands out fake image URLs (or 503s
+while "down"), points the cog at it, and checks that the pool fills,
+refills as URLs are taken, backs off during an outage and recovers.
+
+    python inspireme/standin.py
+"""
+import asyncio
+import types
+
+from aiohttp import web
+
+from inspireme import InspireMe
+
+
+class StandIn:
+    """Fake InspiroBot API: GET /api?generate=true returns a new URL."""
+
+    def __init__(self):
+        self.served = 0
+        self.requests = 0
+        self.down = False
+
+    async def handle(self, request):
+        self.requests += 1
+        if self.down:
+            return web.Response(status=503)
+        self.served += 1
+        return web.Response(text=f"https://generated.inspirobot.me/{self.served}.jpg\n")
+
+
+async def wait_for(condition, timeout=5):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("timed out waiting for the pool")
+        await asyncio.sleep(0.01)
+
+
+async def main():
+    standin = StandIn()
+    app = web.Application()
+    app.router.add_get("/api", standin.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    class LocalInspireMe(InspireMe):
+        API_URL = f"http://127.0.0.1:{port}/api"
+        BACKOFF_MIN = 0.05
+        BACKOFF_MAX = 0.2
+
+    cog = LocalInspireMe(types.SimpleNamespace(loop=asyncio.get_running_loop()))
+    try:
+        await wait_for(lambda: len(cog.pool) == cog.POOL_SIZE)
+        assert standin.served == cog.POOL_SIZE, "prefetched more than the pool holds"
+        print(f"pool filled with {cog.POOL_SIZE} URLs")
+
+        # Taking URLs wakes the refill task, which tops the pool back up.
+        taken = [cog.pool.popleft() for _ in range(3)]
+        cog._consumed.set()
+        await wait_for(lambda: len(cog.pool) == cog.POOL_SIZE)
+        assert not set(taken) & set(cog.pool), "a URL was handed out twice"
+        print("refilled after 3 URLs were taken")
+
+        # During an outage the pool drains and retries back off.
+        standin.down = True
+        cog.pool.clear()
+        cog._consumed.set()
+        await asyncio.sleep(0.5)
+        assert not cog.pool
+        # Backoff doubles 0.05 -> 0.2, so 0.5s allows only a handful of tries.
+        assert standin.requests - standin.served <= 6, "no backoff while the API is down"
+        print(f"outage: {standin.requests - standin.served} retries in 0.5s")
+
+        standin.down = False
+        await wait_for(lambda: len(cog.pool) == cog.POOL_SIZE)
+        print("recovered after the outage")
+    finally:
+        cog.cog_unload()
+        await asyncio.sleep(0.1)  # let the session close
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
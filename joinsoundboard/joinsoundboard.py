@@ -2,8 +2,14 @@ import discord
 from discord.ext import commands, tasks
 from redbot.core import commands as red_commands, Config
 import asyncio
+import time
+from collections import deque
 from typing import Optional
 
+CONNECT_TIMEOUT = 15.0  # seconds to wait for a voice connection to be usable
+READY_POLL = 0.05  # how often to check whether the connection is ready
+LATENCY_SAMPLES = 50  # recent connect latencies kept for the settings view
+
 class JoinSoundboard(red_commands.Cog):
     """Play soundboard sounds when users join voice channels."""
     
@@ -15,7 +21,7 @@ class JoinSoundboard(red_commands.Cog):
         default_guild = {
             "enabled": False,
             "default_sound": None,
-            "disconnect_delay": 5,  # seconds to wait before disconnecting
+            "disconnect_delay": 5,  # seconds to stay connected after the last sound
         }
         
         default_member = {
@@ -25,8 +31,17 @@ class JoinSoundboard(red_commands.Cog):
         self.config.register_guild(**default_guild)
         self.config.register_member(**default_member)
         
-        # Track active connections
-        self.active_plays = {}  # guild_id: asyncio.Task
+        # Voice sessions: one worker per guild keeps the connection open and
+        # plays queued sounds until it has been idle for disconnect_delay
+        self.active_plays = {}  # guild_id: session worker asyncio.Task
+        self.play_queues = {}  # guild_id: deque of (channel, sound_id, member, future)
+        self._play_wakeups = {}  # guild_id: asyncio.Event set when a play is queued
+        self.connect_latencies = deque(maxlen=LATENCY_SAMPLES)
+        
+        # Settings snapshot per guild, loaded on first use and dropped by
+        # the config commands: guild_id -> guild settings + "sounds"
+        # (member_id -> custom_sound for members that have one)
+        self._settings_cache = {}
     
     def cog_unload(self):
         """Cleanup when cog unloads."""
@@ -34,6 +49,24 @@ class JoinSoundboard(red_commands.Cog):
             if not task.done():
                 task.cancel()
     
+    async def _guild_settings(self, guild: discord.Guild) -> dict:
+        """Return the cached settings snapshot for a guild, loading it if needed."""
+        settings = self._settings_cache.get(guild.id)
+        if settings is None:
+            settings = await self.config.guild(guild).all()
+            members = await self.config.all_members(guild)
+            settings["sounds"] = {
+                member_id: data["custom_sound"]
+                for member_id, data in members.items()
+                if data.get("custom_sound") is not None
+            }
+            self._settings_cache[guild.id] = settings
+        return settings
+    
+    def _invalidate(self, guild: discord.Guild):
+        """Drop a guild's snapshot after its config changes."""
+        self._settings_cache.pop(guild.id, None)
+    
     @red_commands.Cog.listener()
     async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
         """Triggered when someone's voice state changes."""
@@ -49,103 +82,155 @@ class JoinSoundboard(red_commands.Cog):
         if before.channel == after.channel:  # No change
             return
         
-        # Get settings
+        # Get settings (a dict lookup once the guild is cached)
         guild = member.guild
-        is_enabled = await self.config.guild(guild).enabled()
+        settings = await self._guild_settings(guild)
         
-        if not is_enabled:
+        if not settings["enabled"]:
             return
         
         # Get sound ID
-        custom_sound = await self.config.member(member).custom_sound()
-        default_sound = await self.config.guild(guild).default_sound()
-        
-        sound_id = custom_sound or default_sound
+        sound_id = settings["sounds"].get(member.id) or settings["default_sound"]
         
         if sound_id is None:
             return
         
-        # Cancel any existing play task for this guild
-        if guild.id in self.active_plays:
-            old_task = self.active_plays[guild.id]
-            if not old_task.done():
-                old_task.cancel()
-                try:
-                    await old_task
-                except asyncio.CancelledError:
-                    pass
-        
-        # Create new play task
-        task = asyncio.create_task(self._play_sound(after.channel, sound_id, member))
-        self.active_plays[guild.id] = task
+        self._queue_play(after.channel, sound_id, member)
+    
+    # ==================== VOICE SESSIONS ====================
     
-    async def _play_sound(self, channel: discord.VoiceChannel, sound_id: int, trigger_member: discord.Member):
-        """Connect to voice, play sound, and disconnect."""
-        voice_client: Optional[discord.VoiceClient] = None
+    def _queue_play(self, channel: discord.VoiceChannel, sound_id: int, trigger_member: discord.Member) -> asyncio.Future:
+        """Queue a sound for the guild's voice session, starting one if needed.
+        
+        Returns a future that resolves once the sound has been played. A burst
+        of joins asking for the same sound in the same channel shares one play.
+        """
         guild = channel.guild
+        queue = self.play_queues.setdefault(guild.id, deque())
+        
+        for pending_channel, pending_sound, _, pending_done in queue:
+            if pending_channel.id == channel.id and pending_sound == sound_id:
+                return pending_done
+        
+        done = asyncio.get_running_loop().create_future()
+        # Join-triggered plays are fire-and-forget; errors are printed by the
+        # session, so mark them retrieved
+        done.add_done_callback(lambda f: f.cancelled() or f.exception())
+        queue.append((channel, sound_id, trigger_member, done))
+        
+        wakeup = self._play_wakeups.setdefault(guild.id, asyncio.Event())
+        wakeup.set()
+        
+        task = self.active_plays.get(guild.id)
+        if task is None or task.done():
+            self.active_plays[guild.id] = asyncio.create_task(self._voice_session(guild))
+        return done
+    
+    async def _voice_session(self, guild: discord.Guild):
+        """Play queued sounds over one connection, disconnecting once idle."""
+        queue = self.play_queues[guild.id]
+        wakeup = self._play_wakeups[guild.id]
         
         try:
-            # Get or create voice connection
-            voice_client = guild.voice_client
-            
-            if voice_client is None:
-                # Not connected, connect now
-                print(f"[JoinSB] Connecting to {channel.name} in {guild.name}")
-                voice_client = await channel.connect(timeout=15.0)
-            elif voice_client.channel.id != channel.id:
-                # Connected to different channel, move
-                print(f"[JoinSB] Moving to {channel.name} in {guild.name}")
-                await voice_client.move_to(channel)
-            
-            # Wait for full connection
-            await asyncio.sleep(2)
-            
-            # Verify connection is ready
-            if not voice_client.is_connected():
-                print(f"[JoinSB] Failed to establish connection to {channel.name}")
-                return
-            
-            # Play the soundboard sound via API
-            print(f"[JoinSB] Playing sound {sound_id} for {trigger_member.name}")
-            
-            try:
-                await self.bot.http.request(
-                    discord.http.Route(
-                        'POST',
-                        '/channels/{channel_id}/send-soundboard-sound',
-                        channel_id=channel.id
-                    ),
-                    json={
-                        'sound_id': str(sound_id),
-                        'source_guild_id': str(guild.id)
-                    }
-                )
-                print(f"[JoinSB] ✅ Successfully played sound")
-            except discord.HTTPException as http_err:
-                print(f"[JoinSB] ❌ HTTP Error: {http_err.status} - {http_err.text}")
-                return
-            
-            # Wait for sound to finish
-            disconnect_delay = await self.config.guild(guild).disconnect_delay()
-            await asyncio.sleep(disconnect_delay)
-            
+            while True:
+                if not queue:
+                    wakeup.clear()
+                    settings = await self._guild_settings(guild)
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), settings["disconnect_delay"])
+                    except asyncio.TimeoutError:
+                        await self._disconnect(guild)
+                        if queue:  # someone joined while we were leaving
+                            continue
+                        break
+                    continue
+                
+                channel, sound_id, trigger_member, done = queue.popleft()
+                try:
+                    await self._connect(channel)
+                    await self._send_sound(channel, sound_id, trigger_member)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"[JoinSB] ❌ Error: {type(e).__name__}: {e}")
+                    if not done.done():
+                        done.set_exception(e)
+                    continue
+                if not done.done():
+                    done.set_result(None)
+        
         except asyncio.CancelledError:
-            print(f"[JoinSB] Play cancelled for {guild.name}")
+            print(f"[JoinSB] Voice session cancelled for {guild.name}")
             raise
-        except Exception as e:
-            print(f"[JoinSB] ❌ Error: {type(e).__name__}: {e}")
         finally:
-            # Disconnect
-            if voice_client and voice_client.is_connected():
-                try:
-                    await voice_client.disconnect(force=False)
-                    print(f"[JoinSB] Disconnected from {guild.name}")
-                except:
-                    pass
-            
-            # Cleanup task tracking
-            if guild.id in self.active_plays:
+            # Cleanup task tracking before awaiting anything, so a join that
+            # arrives during the disconnect starts a fresh session
+            if self.active_plays.get(guild.id) is asyncio.current_task():
                 del self.active_plays[guild.id]
+                self.play_queues.pop(guild.id, None)
+                self._play_wakeups.pop(guild.id, None)
+            for *_, done in queue:
+                if not done.done():
+                    done.cancel()
+            await self._disconnect(guild)
+    
+    async def _connect(self, channel: discord.VoiceChannel) -> discord.VoiceClient:
+        """Make sure the bot is connected to channel and the connection is usable."""
+        guild = channel.guild
+        voice_client = guild.voice_client
+        
+        if voice_client and voice_client.is_connected() and voice_client.channel.id == channel.id:
+            return voice_client
+        
+        start = time.monotonic()
+        if voice_client and voice_client.is_connected():
+            # Connected to different channel, move
+            print(f"[JoinSB] Moving to {channel.name} in {guild.name}")
+            await voice_client.move_to(channel)
+        else:
+            if voice_client:
+                # Stale client left over from a dropped connection
+                await voice_client.disconnect(force=True)
+            print(f"[JoinSB] Connecting to {channel.name} in {guild.name}")
+            voice_client = await channel.connect(timeout=CONNECT_TIMEOUT)
+        
+        # Wait until the connection is actually up in the right channel
+        # rather than sleeping a fixed amount
+        deadline = start + CONNECT_TIMEOUT
+        while not (voice_client.is_connected() and voice_client.channel.id == channel.id):
+            if time.monotonic() > deadline:
+                raise asyncio.TimeoutError(f"voice connection to {channel.name} never became ready")
+            await asyncio.sleep(READY_POLL)
+        
+        latency = time.monotonic() - start
+        self.connect_latencies.append(latency)
+        print(f"[JoinSB] Connected to {channel.name} in {latency:.2f}s")
+        return voice_client
+    
+    async def _send_sound(self, channel: discord.VoiceChannel, sound_id: int, trigger_member: discord.Member):
+        """Play a soundboard sound in the channel the bot is connected to."""
+        print(f"[JoinSB] Playing sound {sound_id} for {trigger_member.name}")
+        await self.bot.http.request(
+            discord.http.Route(
+                'POST',
+                '/channels/{channel_id}/send-soundboard-sound',
+                channel_id=channel.id
+            ),
+            json={
+                'sound_id': str(sound_id),
+                'source_guild_id': str(channel.guild.id)
+            }
+        )
+        print(f"[JoinSB] ✅ Successfully played sound")
+    
+    async def _disconnect(self, guild: discord.Guild):
+        voice_client = guild.voice_client
+        if voice_client and voice_client.is_connected():
+            try:
+                await voice_client.disconnect(force=False)
+                print(f"[JoinSB] Disconnected from {guild.name}")
+            except Exception:
+                pass
     
     # ==================== COMMANDS ====================
     
@@ -155,9 +240,10 @@ class JoinSoundboard(red_commands.Cog):
         """Manage join soundboard settings."""
         if ctx.invoked_subcommand is None:
             # Show current settings
-            enabled = await self.config.guild(ctx.guild).enabled()
-            default_sound = await self.config.guild(ctx.guild).default_sound()
-            delay = await self.config.guild(ctx.guild).disconnect_delay()
+            settings = await self._guild_settings(ctx.guild)
+            enabled = settings["enabled"]
+            default_sound = settings["default_sound"]
+            delay = settings["disconnect_delay"]
             
             embed = discord.Embed(
                 title="Join Soundboard Settings",
@@ -166,6 +252,9 @@ class JoinSoundboard(red_commands.Cog):
             embed.add_field(name="Enabled", value=str(enabled), inline=True)
             embed.add_field(name="Default Sound ID", value=str(default_sound) if default_sound else "None", inline=True)
             embed.add_field(name="Disconnect Delay", value=f"{delay}s", inline=True)
+            if self.connect_latencies:
+                avg = sum(self.connect_latencies) / len(self.connect_latencies)
+                embed.add_field(name="Avg Connect Time", value=f"{avg:.2f}s", inline=True)
             
             await ctx.send(embed=embed)
     
@@ -173,40 +262,46 @@ class JoinSoundboard(red_commands.Cog):
     async def joinsound_enable(self, ctx, enabled: bool):
         """Enable or disable the join soundboard feature."""
         await self.config.guild(ctx.guild).enabled.set(enabled)
+        self._invalidate(ctx.guild)
         await ctx.send(f"✅ Join soundboard {'enabled' if enabled else 'disabled'}.")
     
     @joinsound.command(name="setdefault")
     async def joinsound_setdefault(self, ctx, sound_id: int):
         """Set the default soundboard sound ID for all users."""
         await self.config.guild(ctx.guild).default_sound.set(sound_id)
+        self._invalidate(ctx.guild)
         await ctx.send(f"✅ Default join sound set to ID: `{sound_id}`")
     
     @joinsound.command(name="cleardefault")
     async def joinsound_cleardefault(self, ctx):
         """Clear the default soundboard sound."""
         await self.config.guild(ctx.guild).default_sound.set(None)
+        self._invalidate(ctx.guild)
         await ctx.send("✅ Default sound cleared.")
     
     @joinsound.command(name="setuser")
     async def joinsound_setuser(self, ctx, member: discord.Member, sound_id: int):
         """Set a custom soundboard sound for a specific user."""
         await self.config.member(member).custom_sound.set(sound_id)
+        self._invalidate(ctx.guild)
         await ctx.send(f"✅ Custom join sound for {member.mention} set to ID: `{sound_id}`")
     
     @joinsound.command(name="clearuser")
     async def joinsound_clearuser(self, ctx, member: discord.Member):
         """Clear a user's custom soundboard sound."""
         await self.config.member(member).custom_sound.set(None)
+        self._invalidate(ctx.guild)
         await ctx.send(f"✅ Custom sound cleared for {member.mention}. They will use the default sound.")
     
     @joinsound.command(name="delay")
     async def joinsound_delay(self, ctx, seconds: int):
-        """Set how long the bot waits before disconnecting (1-30 seconds)."""
-        if seconds < 1 or seconds > 30:
-            await ctx.send("❌ Delay must be between 1 and 30 seconds.")
+        """Set how long the bot stays connected after the last sound (1-300 seconds)."""
+        if seconds < 1 or seconds > 300:
+            await ctx.send("❌ Delay must be between 1 and 300 seconds.")
             return
         
         await self.config.guild(ctx.guild).disconnect_delay.set(seconds)
+        self._invalidate(ctx.guild)
         await ctx.send(f"✅ Disconnect delay set to {seconds} seconds.")
     
     @joinsound.command(name="test")
@@ -220,7 +315,7 @@ class JoinSoundboard(red_commands.Cog):
         
         # Get sound ID
         if sound_id is None:
-            sound_id = await self.config.guild(ctx.guild).default_sound()
+            sound_id = (await self._guild_settings(ctx.guild))["default_sound"]
             if sound_id is None:
                 await ctx.send("❌ No sound ID provided and no default sound set.")
                 return
@@ -230,10 +325,8 @@ class JoinSoundboard(red_commands.Cog):
         await ctx.send(f"🔊 Testing sound ID `{sound_id}` in {channel.mention}...")
         
         # Use the same play logic
-        task = asyncio.create_task(self._play_sound(channel, sound_id, ctx.author))
-        
         try:
-            await task
+            await self._queue_play(channel, sound_id, ctx.author)
             await ctx.send("✅ Test complete!")
         except Exception as e:
             await ctx.send(f"❌ Test failed: {e}")
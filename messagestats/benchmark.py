@@ -0,0 +1,110 @@
+"""Micro-benchmark for MessageStats word counting.
+
+Times the original per-word dict loop against the single-pass tokenizer
+and the batch counter over a synthetic corpus, and prints throughput in
+messages per second.
+
+    python messagestats/benchmark.py [--messages 50000] [--seed 0]
+"""
+import argparse
+import random
+import re
+import string
+import time
+from collections import Counter
+
+from message_stats import EXCLUDED_WORDS, MessageStats, iter_words, tokenize_batch
+
+USERS = 50
+
+
+def make_corpus(n, seed):
+    """Chat-like messages drawn from a Zipf-ish vocabulary plus stop words and noise."""
+    rng = random.Random(seed)
+    vocab = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+        for _ in range(5000)
+    ]
+    weights = [1 / rank for rank in range(1, len(vocab) + 1)]
+    stop = sorted(EXCLUDED_WORDS)
+    messages = []
+    for _ in range(n):
+        words = rng.choices(vocab, weights, k=rng.randint(3, 20))
+        words += rng.choices(stop, k=rng.randint(0, 6))
+        if rng.random() < 0.2:
+            words.append(f"https://example.com/{rng.randrange(10**6)}")
+        rng.shuffle(words)
+        text = " ".join(words)
+        messages.append((1, rng.randrange(USERS), text.capitalize() + rng.choice([".", "!", "?", ""])))
+    return messages
+
+
+def legacy(messages):
+    """The original path: findall, list filter, then one dict update per word."""
+    stats = {}
+    for guild_id, user_id, content in messages:
+        counts = stats.setdefault((guild_id, user_id), {})
+        words = re.findall(r'\b[a-z]+\b', content.lower())
+        for word in [w for w in words if w not in EXCLUDED_WORDS and len(w) > 2]:
+            if word in counts:
+                counts[word] += 1
+            else:
+                counts[word] = 1
+    return stats
+
+
+def per_message(messages):
+    """What on_message does now: Counter.update on the tokenizer's generator."""
+    stats = {}
+    for guild_id, user_id, content in messages:
+        stats.setdefault((guild_id, user_id), Counter()).update(iter_words(content))
+    return stats
+
+
+def batched(messages, size=1000):
+    """Batch mode: count queued messages together, then merge per user."""
+    stats = {}
+    for start in range(0, len(messages), size):
+        for key, words in tokenize_batch(messages[start:start + size]).items():
+            stats.setdefault(key, Counter()).update(words)
+    return stats
+
+
+def check_ranking():
+    """Regression check: a user indexed with no messages is ranked once after their first."""
+    cog = MessageStats.__new__(MessageStats)  # skip __init__'s file loading
+    cog.stats = {'1': {
+        '10': {'message_count': 1, 'words': Counter()},
+        '20': {'message_count': 0, 'words': Counter()},
+    }}
+    cog._ranking, cog._top_words, cog._last_used = {}, {}, {}
+    cog._index_guild('1')
+    cog.stats['1']['20']['message_count'] += 1
+    cog._bump_rank('1', '20', 0)
+    ranked = [user_id for user_id, _ in cog.top_chatters_for('1', 10)]
+    assert sorted(ranked) == ['10', '20'], f"ranking is {cog._ranking['1']}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    check_ranking()
+    corpus = make_corpus(args.messages, args.seed)
+    expected = legacy(corpus)
+    print(f"{len(corpus):,} messages, {USERS} users")
+    for name, fn in (("legacy", legacy), ("per-message", per_message), ("batched", batched)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = fn(corpus)
+            best = min(best, time.perf_counter() - start)
+        assert result == expected, f"{name} counts differ from legacy"
+        print(f"{name:>12}: {len(corpus) / best:>12,.0f} msg/s  ({best * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,168 @@
 import discord
 from discord.ext import commands
 from collections import defaultdict, Counter
+import asyncio
+import bisect
+import hashlib
+import heapq
 import json
+import logging
+import math
 import os
 import re
+import tempfile
+import time
+
+log = logging.getLogger("red.MessageStats")
+
+FLUSH_INTERVAL = 30  # seconds between background saves of unsaved stats
+FLUSH_MAX_DIRTY = 500  # unsaved messages that trigger a save straight away
+BATCH_INTERVAL = 2  # seconds between tokenizing queued messages in batch mode
+BATCH_MAX_PENDING = 1000  # queued messages that trigger a batch straight away
+TOP_K = 10  # top words kept up to date per user
+GUILD_IDLE_TIMEOUT = 1800  # seconds before an unused guild is dropped from memory
+# Approximate mode defaults: words tracked per user, and the guild sketch's
+# error (as a fraction of the guild's total words) and failure probability.
+APPROX_CAPACITY = 200
+APPROX_EPSILON = 0.001
+APPROX_DELTA = 0.01
+
+# Common conjunctions and other words to exclude
+EXCLUDED_WORDS = frozenset({
+    # Conjunctions
+    'and', 'but', 'or', 'nor', 'for', 'yet', 'so',
+    # Common articles
+    'a', 'an', 'the',
+    # Common prepositions
+    'in', 'on', 'at', 'to', 'from', 'by', 'with', 'of', 'about',
+    'for', 'as', 'into', 'onto', 'upon', 'over', 'under', 'above',
+    'below', 'through', 'between', 'among', 'during', 'before',
+    'after', 'since', 'until', 'within', 'without', 'toward',
+    # Common pronouns
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him',
+    'her', 'us', 'them', 'my', 'your', 'his', 'its', 'our',
+    'their', 'mine', 'yours', 'hers', 'ours', 'theirs', 'this',
+    'that', 'these', 'those', 'who', 'what', 'which', 'whom',
+    'whose',
+    # Common verbs
+    'is', 'am', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did',
+    # Other common words
+    'not', 'no', 'yes', 'can', 'could', 'will', 'would', 'should',
+    'may', 'might', 'must', 'shall',
+})
+
+# Lowercase words of three or more letters, matched in one pass so short
+# words never reach the exclusion check.
+WORD_RE = re.compile(r'\b[a-z]{3,}\b')
+
+
+def iter_words(content, excluded=EXCLUDED_WORDS):
+    """Yield the countable words in a message."""
+    return (word for word in WORD_RE.findall(content.lower()) if word not in excluded)
+
+
+def tokenize_batch(messages, excluded=EXCLUDED_WORDS):
+    """Tokenize many (guild_id, user_id, content) messages at once.
+
+    Each user's messages are joined and scanned in one pass. Returns
+    {(guild_id, user_id): [words]}, ready for Counter.update. Pure, so it
+    can run in a worker thread.
+    """
+    grouped = defaultdict(list)
+    for guild_id, user_id, content in messages:
+        grouped[guild_id, user_id].append(content)
+    return {
+        key: [word for word in WORD_RE.findall("\n".join(contents).lower()) if word not in excluded]
+        for key, contents in grouped.items()
+    }
+
+
+class SpaceSaving:
+    """Fixed-size heavy-hitters summary (Space-Saving) over a word -> count dict.
+
+    At most capacity words are kept. When a new word arrives with the
+    summary full, it replaces the least counted word and inherits that
+    count, so counts never underestimate; errors[word] is how much a
+    count may be overestimated by. Any word used more than
+    total / capacity times is guaranteed to be kept.
+    """
+
+    def __init__(self, counts, errors, capacity):
+        self.counts = counts
+        self.errors = errors
+        self.capacity = capacity
+        self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        # Lazy min-heap: entries whose count has since changed are skipped
+        self._heap = [(count, word) for word, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+    def _pop_min(self):
+        while True:
+            count, word = heapq.heappop(self._heap)
+            if self.counts.get(word) == count:
+                return word, count
+
+    def update(self, words):
+        counts, errors = self.counts, self.errors
+        for word in words:
+            if word in counts:
+                counts[word] += 1
+            elif len(counts) < self.capacity:
+                counts[word] = 1
+            else:
+                evicted, low = self._pop_min()
+                del counts[evicted]
+                errors.pop(evicted, None)
+                counts[word] = low + 1
+                errors[word] = low
+            heapq.heappush(self._heap, (counts[word], word))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+
+class CountMinSketch:
+    """Count-min sketch of word counts.
+
+    Estimates never undercount, and overcount by more than epsilon * total
+    words with probability at most delta. Hashing is blake2b-based so a
+    saved sketch stays valid across restarts.
+    """
+
+    def __init__(self, width, depth, table=None):
+        self.width = width
+        self.depth = depth
+        self.table = table or [[0] * width for _ in range(depth)]
+
+    @classmethod
+    def for_error(cls, epsilon, delta):
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)))
+
+    def _cells(self, word):
+        digest = hashlib.blake2b(word.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, word, count=1):
+        for row, cell in zip(self.table, self._cells(word)):
+            row[cell] += count
+
+    def update(self, words):
+        for word, count in Counter(words).items():
+            self.add(word, count)
+
+    def estimate(self, word):
+        return min(row[cell] for row, cell in zip(self.table, self._cells(word)))
+
+    def to_json(self):
+        return {'width': self.width, 'depth': self.depth, 'table': [row[:] for row in self.table]}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data['width'], data['depth'], data['table'])
 
 
 class MessageStats(commands.Cog):
@@ -11,56 +170,382 @@ class MessageStats(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.data_file = 'message_stats.json'
-        
-        # Common conjunctions and other words to exclude
-        self.excluded_words = {
-            # Conjunctions
-            'and', 'but', 'or', 'nor', 'for', 'yet', 'so',
-            # Common articles
-            'a', 'an', 'the',
-            # Common prepositions
-            'in', 'on', 'at', 'to', 'from', 'by', 'with', 'of', 'about',
-            'for', 'as', 'into', 'onto', 'upon', 'over', 'under', 'above',
-            'below', 'through', 'between', 'among', 'during', 'before',
-            'after', 'since', 'until', 'within', 'without', 'toward',
-            # Common pronouns
-            'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him',
-            'her', 'us', 'them', 'my', 'your', 'his', 'its', 'our',
-            'their', 'mine', 'yours', 'hers', 'ours', 'theirs', 'this',
-            'that', 'these', 'those', 'who', 'what', 'which', 'whom',
-            'whose',
-            # Common verbs
-            'is', 'am', 'are', 'was', 'were', 'be', 'been', 'being',
-            'have', 'has', 'had', 'do', 'does', 'did',
-            # Other common words
-            'not', 'no', 'yes', 'can', 'could', 'will', 'would', 'should',
-            'may', 'might', 'must', 'shall',
-        }
-        
-        # Load existing data
-        self.stats = self.load_stats()
+        # One <guild_id>.json file per guild, so saving or resetting a guild
+        # only touches its own file. approx.json exists only in approximate mode.
+        self.data_dir = os.path.join(os.path.dirname(__file__), 'data')
+        self.approx_file = os.path.join(self.data_dir, 'approx.json')
+        # Where stats for every guild used to be kept, relative to the CWD
+        self.legacy_file = 'message_stats.json'
+        self.legacy_approx_file = 'message_stats_approx.json'
+        
+        self.excluded_words = EXCLUDED_WORDS
+
+        # Approximate mode: per-user words are capped Space-Saving summaries
+        # and each guild keeps a count-min sketch of all its words.
+        self.approx = None  # {'capacity', 'epsilon', 'delta'} when enabled
+        self._sketches = {}  # guild_id -> CountMinSketch
+        self._summaries = {}  # (guild_id, user_id) -> SpaceSaving, built lazily
+
+        # Leaderboards kept alongside the stats so queries never scan a
+        # whole vocabulary or guild. Counts only ever go up, so a word can
+        # only enter a user's top words by passing the smallest one there.
+        self._top_words = {}  # (guild_id, user_id) -> {word: count}, TOP_K largest
+        self._ranking = {}  # guild_id -> sorted [(-message_count, user_id)]
+
+        # Guilds are loaded from their file on first use and dropped again
+        # once they've been idle for GUILD_IDLE_TIMEOUT with nothing unsaved.
+        self.stats = {}  # guild_id -> {user_id: stats}, loaded guilds only
+        self._last_used = {}  # guild_id -> time.monotonic() of last access
+        self._loading = {}  # guild_id -> task reading its file
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.migrate_legacy()
+        self.load_approx()
+
+        # Stats are saved in the background rather than on every message;
+        # _dirty counts messages recorded since the last save and
+        # _dirty_guilds the guilds whose files need rewriting.
+        self.flush_interval = FLUSH_INTERVAL
+        self.flush_max_dirty = FLUSH_MAX_DIRTY
+        self._dirty = 0
+        self._dirty_guilds = set()
+        self._flush_now = asyncio.Event()
+        self._save_lock = asyncio.Lock()
+        self._flush_task = None
+
+        # In batch mode on_message only queues (guild_id, user_id, content);
+        # batch_loop tokenizes the queue together in a worker thread.
+        self.batch_mode = False
+        self._pending = []
+        self._batch_now = asyncio.Event()
+        self._batch_task = None
+
+    async def cog_load(self):
+        self._flush_task = asyncio.create_task(self.flush_loop())
+        self._batch_task = asyncio.create_task(self.batch_loop())
+
+    async def cog_unload(self):
+        """Stop the background tasks and write out anything unsaved."""
+        for task in (self._flush_task, self._batch_task):
+            if task:
+                task.cancel()
+        await self.count_pending()
+        await self.flush_stats()
     
-    def load_stats(self):
-        """Load statistics from JSON file."""
-        if os.path.exists(self.data_file):
+    def _guild_file(self, guild_id):
+        return os.path.join(self.data_dir, f'{guild_id}.json')
+
+    def migrate_legacy(self):
+        """Split the old single message_stats.json into per-guild files, once."""
+        if not os.path.exists(self.legacy_file):
+            return
+        try:
+            with open(self.legacy_file, 'r') as f:
+                stats = json.load(f)
+        except json.JSONDecodeError:
+            log.warning("Not migrating unreadable %s", self.legacy_file)
+            return
+        sketches = {}
+        if os.path.exists(self.legacy_approx_file):
+            with open(self.legacy_approx_file, 'r') as f:
+                approx = json.load(f)
+            sketches = approx['sketches']
+            self._write_json(self.approx_file, approx['settings'])
+            os.replace(self.legacy_approx_file, self.legacy_approx_file + '.migrated')
+        for guild_id, users in stats.items():
+            shard = {'users': users}
+            if guild_id in sketches:
+                shard['sketch'] = sketches[guild_id]
+            self._write_json(self._guild_file(guild_id), shard)
+        # Kept as a backup rather than deleted
+        os.replace(self.legacy_file, self.legacy_file + '.migrated')
+        log.info("Migrated message stats for %d guilds to %s", len(stats), self.data_dir)
+
+    def load_approx(self):
+        """Load approximate-mode settings, if that mode is on."""
+        if os.path.exists(self.approx_file):
+            with open(self.approx_file, 'r') as f:
+                self.approx = json.load(f)
+
+    def _read_shard(self, guild_id):
+        """Parse a guild's file; returns (users, sketch JSON or None). Blocking."""
+        users, sketch = {}, None
+        path = self._guild_file(guild_id)
+        if os.path.exists(path):
             try:
-                with open(self.data_file, 'r') as f:
-                    return json.load(f)
+                with open(path, 'r') as f:
+                    shard = json.load(f)
             except json.JSONDecodeError:
-                return {}
-        return {}
+                log.exception("Ignoring unreadable stats file %s", path)
+            else:
+                users, sketch = shard['users'], shard.get('sketch')
+        for user in users.values():
+            user['words'] = Counter(user['words'])
+        return users, sketch
+
+    async def load_guild(self, guild_id):
+        """Make sure a guild is in memory, reading its file in a worker thread.
+
+        Concurrent callers for the same guild share one read.
+        """
+        guild_id = str(guild_id)
+        if guild_id not in self.stats:
+            task = self._loading.get(guild_id)
+            if task is None:
+                task = self._loading[guild_id] = asyncio.ensure_future(self._load_guild(guild_id))
+                task.add_done_callback(lambda _: self._loading.pop(guild_id, None))
+            await task
+        self._last_used[guild_id] = time.monotonic()
+
+    async def _load_guild(self, guild_id):
+        loop = asyncio.get_running_loop()
+        users, sketch = await loop.run_in_executor(None, self._read_shard, guild_id)
+        if guild_id not in self.stats:
+            self._install_guild(guild_id, users, sketch)
+
+    def _install_guild(self, guild_id, users, sketch):
+        """Put a guild read from disk in memory, converting it if the counting mode changed."""
+        self.stats[guild_id] = users
+        if sketch is not None:
+            self._sketches[guild_id] = CountMinSketch.from_json(sketch)
+
+        # The mode is switched only for guilds in memory at the time; the
+        # rest catch up here.
+        if self.approx is not None and sketch is None:
+            self._approximate_guild(guild_id)
+            self._dirty_guilds.add(guild_id)
+        elif self.approx is None and sketch is not None:
+            self._exact_guild(guild_id)
+            self._dirty_guilds.add(guild_id)
+        self._index_guild(guild_id)
+
+    def _evict_guild(self, guild_id):
+        """Drop a guild and everything derived from it from memory."""
+        self.stats.pop(guild_id, None)
+        self._last_used.pop(guild_id, None)
+        self._ranking.pop(guild_id, None)
+        self._sketches.pop(guild_id, None)
+        for key in [k for k in self._top_words if k[0] == guild_id]:
+            del self._top_words[key]
+            self._summaries.pop(key, None)
+
+    def evict_idle(self):
+        """Drop guilds that are saved and haven't been used for GUILD_IDLE_TIMEOUT."""
+        cutoff = time.monotonic() - GUILD_IDLE_TIMEOUT
+        idle = [
+            guild_id for guild_id, used in self._last_used.items()
+            if used < cutoff and guild_id not in self._dirty_guilds
+        ]
+        for guild_id in idle:
+            self._evict_guild(guild_id)
+        return len(idle)
     
-    def save_stats(self):
-        """Save statistics to JSON file."""
-        with open(self.data_file, 'w') as f:
-            json.dump(self.stats, f, indent=2)
+    def _write_stats(self, shards):
+        """Atomically replace the given guilds' files."""
+        for guild_id, shard in shards.items():
+            self._write_json(self._guild_file(guild_id), shard)
+
+    @staticmethod
+    def _write_json(path, data):
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _snapshot_stats(self, guild_ids):
+        """Copy the given guilds so they can be serialized off the event loop."""
+        shards = {}
+        for guild_id in guild_ids:
+            if guild_id not in self.stats:
+                continue
+            shard = {
+                'users': {
+                    user_id: self._snapshot_user(user)
+                    for user_id, user in self.stats[guild_id].items()
+                }
+            }
+            if guild_id in self._sketches:
+                shard['sketch'] = self._sketches[guild_id].to_json()
+            shards[guild_id] = shard
+        return shards
+
+    @staticmethod
+    def _snapshot_user(user):
+        snapshot = {'message_count': user['message_count'], 'words': dict(user['words'])}
+        if 'errors' in user:
+            snapshot['errors'] = dict(user['errors'])
+        return snapshot
+
+    def mark_dirty(self, guild_id):
+        """Record an unsaved change to a guild, saving early once enough pile up."""
+        self._dirty_guilds.add(str(guild_id))
+        self._dirty += 1
+        if self._dirty >= self.flush_max_dirty:
+            self._flush_now.set()
+
+    async def flush_stats(self):
+        """Write unsaved stats to disk in a worker thread."""
+        async with self._save_lock:
+            if not self._dirty_guilds:
+                return
+            guilds, self._dirty_guilds = self._dirty_guilds, set()
+            snapshot = self._snapshot_stats(guilds)
+            dirty, self._dirty = self._dirty, 0
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, self._write_stats, snapshot)
+            except OSError:
+                self._dirty += dirty
+                self._dirty_guilds |= guilds
+                log.exception("Failed to save message stats")
+
+    async def flush_loop(self):
+        """Save dirty stats every flush_interval seconds, or sooner if asked,
+        then drop idle guilds from memory."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            await self.flush_stats()
+            self.evict_idle()
     
+    def _index_guild(self, guild_id):
+        """Build a guild's ranking and its users' top words from scratch."""
+        users = self.stats[guild_id]
+        self._ranking[guild_id] = sorted(
+            (-user['message_count'], user_id)
+            for user_id, user in users.items() if user['message_count']
+        )
+        for user_id, user in users.items():
+            self._top_words[guild_id, user_id] = dict(
+                heapq.nlargest(TOP_K, user['words'].items(), key=lambda x: x[1])
+            )
+
+    def _bump_rank(self, guild_id, user_id, old_count):
+        """Move a user up the guild's ranking after message_count went up."""
+        guild_id, user_id = str(guild_id), str(user_id)
+        ranking = self._ranking[guild_id]
+        i = bisect.bisect_left(ranking, (-old_count, user_id))
+        if i < len(ranking) and ranking[i] == (-old_count, user_id):
+            del ranking[i]
+        new_count = self.stats[guild_id][user_id]['message_count']
+        bisect.insort(ranking, (-new_count, user_id))
+
+    def _note_words(self, guild_id, user_id, words):
+        """Update a user's top words after their counts took in words."""
+        guild_id, user_id = str(guild_id), str(user_id)
+        counts = self.stats[guild_id][user_id]['words']
+        top = self._top_words.setdefault((guild_id, user_id), {})
+        for word in set(words):
+            if word in top or len(top) < TOP_K:
+                top[word] = counts[word]
+                continue
+            lowest = min(top, key=top.get)
+            if counts[word] > top[lowest]:
+                del top[lowest]
+                top[word] = counts[word]
+
+    def _count_words(self, guild_id, user_id, words):
+        """Add a user's words to their counts (and the guild sketch in approximate mode)."""
+        user_stats = self.get_user_stats(guild_id, user_id)
+        if self.approx is None:
+            user_stats['words'].update(words)
+        else:
+            guild_id, user_id = str(guild_id), str(user_id)
+            summary = self._summaries.get((guild_id, user_id))
+            if summary is None:
+                summary = self._summaries[guild_id, user_id] = SpaceSaving(
+                    user_stats['words'], user_stats.setdefault('errors', {}), self.approx['capacity']
+                )
+            summary.update(words)
+            sketch = self._sketches.get(guild_id)
+            if sketch is None:
+                sketch = self._sketches[guild_id] = CountMinSketch.for_error(
+                    self.approx['epsilon'], self.approx['delta']
+                )
+            sketch.update(words)
+        self._note_words(guild_id, user_id, words)
+
+    def guild_word_count(self, guild_id, word):
+        """How often anyone in the guild used word (an upper-bound estimate in approximate mode)."""
+        users = self.get_server_stats(guild_id)
+        if self.approx is not None:
+            sketch = self._sketches.get(str(guild_id))
+            return sketch.estimate(word) if sketch else 0
+        return sum(user['words'][word] for user in users.values())
+
+    def _approximate_guild(self, guild_id):
+        """Fold a guild's exact counts into a sketch and capped per-user words."""
+        capacity = self.approx['capacity']
+        sketch = self._sketches[guild_id] = CountMinSketch.for_error(
+            self.approx['epsilon'], self.approx['delta']
+        )
+        for user in self.stats[guild_id].values():
+            for word, count in user['words'].items():
+                sketch.add(word, count)
+            # The dropped tail words were each counted no more than the
+            # smallest kept word, so the Space-Saving bound still holds.
+            user['words'] = Counter(dict(
+                heapq.nlargest(capacity, user['words'].items(), key=lambda x: x[1])
+            ))
+            user['errors'] = {}
+
+    def _exact_guild(self, guild_id):
+        """Drop a guild's sketch and error bounds, keeping the capped counts."""
+        self._sketches.pop(guild_id, None)
+        for user_id, user in self.stats[guild_id].items():
+            user.pop('errors', None)
+            self._summaries.pop((guild_id, user_id), None)
+
+    def enable_approx(self, capacity, epsilon, delta):
+        """Switch to approximate mode; guilds not in memory convert when next loaded."""
+        self.approx = {'capacity': capacity, 'epsilon': epsilon, 'delta': delta}
+        for guild_id in self.stats:
+            self._approximate_guild(guild_id)
+            self._index_guild(guild_id)
+            self._dirty_guilds.add(guild_id)
+
+    def disable_approx(self):
+        """Go back to exact counting; approximate counts are kept as they are."""
+        self.approx = None
+        for guild_id in self.stats:
+            self._exact_guild(guild_id)
+            self._dirty_guilds.add(guild_id)
+
+    def top_words_for(self, guild_id, user_id, limit=TOP_K):
+        """A user's most used words as (word, count), most used first."""
+        user_stats = self.get_user_stats(guild_id, user_id)
+        if limit > TOP_K:
+            return user_stats['words'].most_common(limit)
+        top = self._top_words.get((str(guild_id), str(user_id)), {})
+        return heapq.nlargest(limit, top.items(), key=lambda x: x[1])
+
+    def top_word_for(self, guild_id, user_id):
+        """A user's most used word as (word, count), or ("N/A", 0)."""
+        top = self.top_words_for(guild_id, user_id, 1)
+        return top[0] if top else ("N/A", 0)
+
+    def top_chatters_for(self, guild_id, limit):
+        """(user_id, stats) for the guild's biggest chatters, most messages first."""
+        users = self.get_server_stats(guild_id)
+        return [(user_id, users[user_id]) for _, user_id in self._ranking[str(guild_id)][:limit]]
+
     def get_server_stats(self, guild_id):
-        """Get or create stats for a specific server."""
+        """Get stats for a specific server.
+
+        Await load_guild first; loading here instead blocks the event loop
+        and is only a fallback.
+        """
         guild_id = str(guild_id)
         if guild_id not in self.stats:
-            self.stats[guild_id] = {}
+            self._install_guild(guild_id, *self._read_shard(guild_id))
+        self._last_used[guild_id] = time.monotonic()
         return self.stats[guild_id]
     
     def get_user_stats(self, guild_id, user_id):
@@ -70,22 +555,41 @@ class MessageStats(commands.Cog):
         if user_id not in server_stats:
             server_stats[user_id] = {
                 'message_count': 0,
-                'words': {}
+                'words': Counter()
             }
         return server_stats[user_id]
     
     def extract_words(self, message_content):
         """Extract words from message, excluding conjunctions and common words."""
-        # Convert to lowercase and extract words (alphanumeric only)
-        words = re.findall(r'\b[a-z]+\b', message_content.lower())
-        
-        # Filter out excluded words and very short words
-        filtered_words = [
-            word for word in words 
-            if word not in self.excluded_words and len(word) > 2
-        ]
-        
-        return filtered_words
+        return list(iter_words(message_content, self.excluded_words))
+
+    async def count_pending(self):
+        """Tokenize queued batch-mode messages and add their word counts."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        loop = asyncio.get_running_loop()
+        counts = await loop.run_in_executor(
+            None, tokenize_batch, pending, self.excluded_words
+        )
+        for guild_id in {guild_id for guild_id, _ in counts}:
+            await self.load_guild(guild_id)
+        for (guild_id, user_id), words in counts.items():
+            self._count_words(guild_id, user_id, words)
+            self.mark_dirty(guild_id)
+
+    async def batch_loop(self):
+        """Count queued messages every BATCH_INTERVAL seconds, or sooner if asked."""
+        while True:
+            try:
+                await asyncio.wait_for(self._batch_now.wait(), BATCH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_now.clear()
+            try:
+                await self.count_pending()
+            except Exception:
+                log.exception("Failed to count queued messages")
     
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -96,28 +600,31 @@ class MessageStats(commands.Cog):
         
         guild_id = message.guild.id
         user_id = message.author.id
+        await self.load_guild(guild_id)
         
         # Get user stats
         user_stats = self.get_user_stats(guild_id, user_id)
         
         # Increment message count
         user_stats['message_count'] += 1
+        self._bump_rank(guild_id, user_id, user_stats['message_count'] - 1)
         
         # Extract and count words
-        words = self.extract_words(message.content)
-        for word in words:
-            if word in user_stats['words']:
-                user_stats['words'][word] += 1
-            else:
-                user_stats['words'][word] = 1
+        if self.batch_mode:
+            self._pending.append((guild_id, user_id, message.content))
+            if len(self._pending) >= BATCH_MAX_PENDING:
+                self._batch_now.set()
+        else:
+            words = list(iter_words(message.content, self.excluded_words))
+            self._count_words(guild_id, user_id, words)
         
-        # Save stats periodically (every message in this case)
-        # For better performance, you could save less frequently
-        self.save_stats()
+        # Saved in the background by flush_loop
+        self.mark_dirty(guild_id)
     
     @commands.command(name='mystats')
     async def my_stats(self, ctx):
         """Show your message statistics."""
+        await self.load_guild(ctx.guild.id)
         user_stats = self.get_user_stats(ctx.guild.id, ctx.author.id)
         
         message_count = user_stats['message_count']
@@ -127,14 +634,7 @@ class MessageStats(commands.Cog):
             return
         
         # Find most common word
-        if user_stats['words']:
-            most_common_word, word_count = max(
-                user_stats['words'].items(), 
-                key=lambda x: x[1]
-            )
-        else:
-            most_common_word = "N/A"
-            word_count = 0
+        most_common_word, word_count = self.top_word_for(ctx.guild.id, ctx.author.id)
         
         embed = discord.Embed(
             title=f"📊 Stats for {ctx.author.display_name}",
@@ -157,6 +657,7 @@ class MessageStats(commands.Cog):
     @commands.has_permissions(manage_messages=True)
     async def user_stats(self, ctx, member: discord.Member):
         """Show message statistics for a specific user."""
+        await self.load_guild(ctx.guild.id)
         user_stats = self.get_user_stats(ctx.guild.id, member.id)
         
         message_count = user_stats['message_count']
@@ -166,14 +667,7 @@ class MessageStats(commands.Cog):
             return
         
         # Find most common word
-        if user_stats['words']:
-            most_common_word, word_count = max(
-                user_stats['words'].items(), 
-                key=lambda x: x[1]
-            )
-        else:
-            most_common_word = "N/A"
-            word_count = 0
+        most_common_word, word_count = self.top_word_for(ctx.guild.id, member.id)
         
         embed = discord.Embed(
             title=f"📊 Stats for {member.display_name}",
@@ -195,18 +689,15 @@ class MessageStats(commands.Cog):
     @commands.command(name='topchatters')
     async def top_chatters(self, ctx, limit: int = 10):
         """Show the top chatters in the server."""
+        await self.load_guild(ctx.guild.id)
         server_stats = self.get_server_stats(ctx.guild.id)
         
         if not server_stats:
             await ctx.send("No message data available yet!")
             return
         
-        # Sort users by message count
-        sorted_users = sorted(
-            server_stats.items(),
-            key=lambda x: x[1]['message_count'],
-            reverse=True
-        )[:limit]
+        # Users by message count, from the maintained ranking
+        sorted_users = self.top_chatters_for(ctx.guild.id, limit)
         
         embed = discord.Embed(
             title=f"🏆 Top {limit} Chatters in {ctx.guild.name}",
@@ -218,11 +709,8 @@ class MessageStats(commands.Cog):
             name = member.display_name if member else f"User {user_id}"
             
             # Get most common word
-            if stats['words']:
-                most_common_word, word_count = max(
-                    stats['words'].items(),
-                    key=lambda x: x[1]
-                )
+            most_common_word, word_count = self.top_word_for(ctx.guild.id, user_id)
+            if word_count:
                 word_info = f"Most used: '{most_common_word}' ({word_count}x)"
             else:
                 word_info = "No words tracked"
@@ -238,6 +726,7 @@ class MessageStats(commands.Cog):
     @commands.command(name='topwords')
     async def top_words(self, ctx, member: discord.Member = None, limit: int = 10):
         """Show the top words used by a user (or yourself)."""
+        await self.load_guild(ctx.guild.id)
         if member is None:
             member = ctx.author
         
@@ -248,7 +737,7 @@ class MessageStats(commands.Cog):
             return
         
         # Get top words
-        top_words = Counter(user_stats['words']).most_common(limit)
+        top_words = self.top_words_for(ctx.guild.id, member.id, limit)
         
         embed = discord.Embed(
             title=f"📝 Top {limit} Words for {member.display_name}",
@@ -265,18 +754,124 @@ class MessageStats(commands.Cog):
         
         await ctx.send(embed=embed)
     
+    @commands.command(name='statsflush')
+    @commands.is_owner()
+    async def stats_flush(self, ctx, interval: int = None, max_dirty: int = None):
+        """Show or set how often message statistics are saved.
+
+        interval is in seconds; max_dirty is how many unsaved messages
+        trigger an early save.
+        """
+        if interval is not None:
+            if interval < 1 or (max_dirty is not None and max_dirty < 1):
+                await ctx.send("❌ Interval and message count must be at least 1.")
+                return
+            self.flush_interval = interval
+            if max_dirty is not None:
+                self.flush_max_dirty = max_dirty
+            # Wake the saver so the new interval takes effect immediately
+            self._flush_now.set()
+
+        await ctx.send(
+            f"💾 Saving every {self.flush_interval}s or after "
+            f"{self.flush_max_dirty:,} messages ({self._dirty:,} unsaved)."
+        )
+
+    @commands.command(name='statsbatch')
+    @commands.is_owner()
+    async def stats_batch(self, ctx, enabled: bool = None):
+        """Show or toggle batch mode.
+
+        In batch mode words are counted every few seconds in a worker
+        thread instead of inside on_message.
+        """
+        if enabled is not None:
+            self.batch_mode = enabled
+            if not enabled:
+                await self.count_pending()
+
+        await ctx.send(
+            f"🧮 Batch mode is {'on' if self.batch_mode else 'off'} "
+            f"({len(self._pending):,} messages queued)."
+        )
+
+    @commands.command(name='wordfreq')
+    async def word_freq(self, ctx, word: str):
+        """Show how often a word has been used in this server."""
+        await self.load_guild(ctx.guild.id)
+        word = word.lower()
+        count = self.guild_word_count(ctx.guild.id, word)
+        note = " (estimate)" if self.approx is not None else ""
+        await ctx.send(f"📝 **{word}** has been used {count:,} times{note}.")
+
+    @commands.command(name='statsmode')
+    @commands.is_owner()
+    async def stats_mode(self, ctx, mode: str = None, capacity: int = APPROX_CAPACITY, epsilon: float = APPROX_EPSILON):
+        """Show or switch between exact and approximate word counting.
+
+        approx keeps each user's `capacity` most used words (exact for
+        frequent words, approximate for the tail) and a per-server
+        count-min sketch whose estimates are off by at most `epsilon` of
+        the server's total words. Lower epsilon and higher capacity use
+        more memory. Switching back to exact keeps the approximate counts.
+        Servers not currently in memory are converted when next loaded.
+        """
+        if mode is not None:
+            mode = mode.lower()
+            if mode not in ('exact', 'approx'):
+                await ctx.send("❌ Mode must be `exact` or `approx`.")
+                return
+            loop = asyncio.get_running_loop()
+            if mode == 'approx':
+                if self.approx is not None:
+                    await ctx.send("❌ Already approximate; switch to `exact` first to change settings.")
+                    return
+                if capacity <= TOP_K or not 0 < epsilon < 1:
+                    await ctx.send(f"❌ Capacity must be over {TOP_K} and epsilon between 0 and 1.")
+                    return
+                await self.count_pending()
+                self.enable_approx(capacity, epsilon, APPROX_DELTA)
+                await loop.run_in_executor(None, self._write_json, self.approx_file, self.approx)
+            elif self.approx is not None:
+                await self.count_pending()
+                self.disable_approx()
+                await loop.run_in_executor(None, os.remove, self.approx_file)
+            await self.flush_stats()
+
+        words = sum(len(user['words']) for users in self.stats.values() for user in users.values())
+        loaded = f"{len(self.stats):,} servers loaded"
+        if self.approx is None:
+            await ctx.send(f"🔢 Exact counting ({words:,} words stored, {loaded}).")
+        else:
+            cells = sum(s.width * s.depth for s in self._sketches.values())
+            await ctx.send(
+                f"🔢 Approximate counting: {self.approx['capacity']:,} words per user, "
+                f"sketch epsilon {self.approx['epsilon']:g} "
+                f"({words:,} words, {cells:,} sketch cells stored, {loaded})."
+            )
+
     @commands.command(name='resetstats')
     @commands.has_permissions(administrator=True)
     async def reset_stats(self, ctx):
         """Reset all statistics for this server (Admin only)."""
         guild_id = str(ctx.guild.id)
-        
-        if guild_id in self.stats:
-            del self.stats[guild_id]
-            self.save_stats()
-            await ctx.send("✅ All statistics for this server have been reset!")
-        else:
-            await ctx.send("No statistics to reset!")
+        path = self._guild_file(guild_id)
+        
+        # Under the save lock so a flush in progress can't rewrite the file,
+        # and after any read of it so that can't bring the old stats back.
+        async with self._save_lock:
+            if guild_id in self._loading:
+                await self._loading[guild_id]
+            exists = os.path.exists(path)
+            if not self.stats.get(guild_id) and not exists:
+                await ctx.send("No statistics to reset!")
+                return
+            self._evict_guild(guild_id)
+            self._dirty_guilds.discard(guild_id)
+            self._pending = [m for m in self._pending if m[0] != ctx.guild.id]
+            if exists:
+                os.remove(path)
+        await ctx.send("✅ All statistics for this server have been reset!")
 
 
 async def setup(bot):
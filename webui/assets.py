@@ -0,0 +1,110 @@
+import gzip
+import hashlib
+import logging
+import mimetypes
+import re
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+log = logging.getLogger("red.WebUI")
+
+# <!-- include: header.html --> in a page is replaced by that file's contents
+INCLUDE_RE = re.compile(r"<!--\s*include:\s*([\w.-]+)\s*-->")
+# Hashed URLs never change content; everything else is revalidated by ETag.
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+# Smaller files aren't worth compressing
+MIN_COMPRESS_SIZE = 256
+
+
+def accepts(accept_encoding, encoding):
+    """Whether an Accept-Encoding header allows encoding; q=0 refuses it."""
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, *params = (p.strip() for p in part.split(";"))
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            qualities[coding.lower()] = q
+    return qualities.get(encoding, qualities.get("*", 0)) > 0
+
+
+class Asset:
+    """A static file held in memory, precompressed and content-hashed."""
+
+    def __init__(self, name, data):
+        self.name = name
+        self.content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+        self.etag = f'"{digest}"'
+        stem, dot, ext = name.rpartition(".")
+        self.hashed_name = f"{stem}.{digest}.{ext}" if dot else f"{name}.{digest}"
+        self.bodies = {"identity": data}
+        if len(data) >= MIN_COMPRESS_SIZE:
+            if brotli is not None:
+                self.bodies["br"] = brotli.compress(data)
+            self.bodies["gzip"] = gzip.compress(data, 9, mtime=0)
+
+    def negotiate(self, accept_encoding):
+        """The (encoding, body) to send for an Accept-Encoding header."""
+        for encoding in ("br", "gzip"):
+            if encoding in self.bodies and accepts(accept_encoding, encoding):
+                return encoding, self.bodies[encoding]
+        return "identity", self.bodies["identity"]
+
+
+class AssetStore:
+    """Every file under the static directory, ready to serve.
+
+    HTML pages have their includes inlined and their references to other
+    assets rewritten to hashed names, which can be cached forever.
+    """
+
+    def __init__(self, static_dir):
+        files = {
+            path.relative_to(static_dir).as_posix(): path.read_bytes()
+            for path in sorted(static_dir.rglob("*")) if path.is_file()
+        }
+        self.assets = {}
+        for name, data in files.items():
+            if not name.endswith(".html"):
+                self.assets[name] = Asset(name, data)
+        linkable = dict(self.assets)
+        for name, data in files.items():
+            if name.endswith(".html"):
+                self.assets[name] = Asset(name, self._render_page(name, data.decode(), files, linkable))
+        self.hashed = {asset.hashed_name: asset for asset in self.assets.values()}
+
+    @staticmethod
+    def _render_page(page, html, files, linkable):
+        def include(match):
+            if match.group(1) not in files:
+                log.warning("%s includes missing file %s; leaving the marker", page, match.group(1))
+                return match.group(0)
+            return files[match.group(1)].decode()
+
+        html = INCLUDE_RE.sub(include, html)
+        for name, asset in linkable.items():
+            html = re.sub(
+                rf"""(href|src)=(["'])/?{re.escape(name)}\2""",
+                rf"\1=\2/{asset.hashed_name}\2",
+                html,
+            )
+        return html.encode()
+
+    def get(self, path):
+        """(asset, cache_control) for a request path, or (None, None)."""
+        if path in self.hashed:
+            return self.hashed[path], IMMUTABLE
+        if path in self.assets:
+            return self.assets[path], REVALIDATE
+        return None, None
@@ -1,5 +1,11 @@
 import asyncio
+import base64
+import bisect
+import gzip
+import hashlib
+import json
 import logging
+from collections import defaultdict
 from pathlib import Path
 from urllib.parse import urlencode
 
@@ -10,9 +16,56 @@ from redbot.core.bot import Red
 from redbot.cogs.customcom import CustomCommands
 import discord
 
+from .assets import MIN_COMPRESS_SIZE, AssetStore, accepts
+
 log = logging.getLogger("red.WebUI")
 
 DISCORD_API_BASE = "https://discord.com/api"
+# Dashboard aggregates are recomputed in the background at most this often
+# (seconds), and straight away when the bot joins or leaves a guild.
+SNAPSHOT_INTERVAL = 30
+# /api/stream: message counter deltas are pushed to dashboards once per
+# STREAM_INTERVAL; a client that can't take a frame within
+# STREAM_WRITE_TIMEOUT is disconnected.
+STREAM_INTERVAL = 1
+STREAM_KEEPALIVE = 15
+STREAM_WRITE_TIMEOUT = 10
+MAX_STREAM_CLIENTS = 50
+# /api/guilds page sizes and the fields a client may select
+GUILDS_PAGE_SIZE = 100
+GUILDS_MAX_PAGE_SIZE = 500
+GUILD_FIELDS = ("id", "name", "member_count", "message_count")
+# Most commands one bulk custom-command request may create, edit or delete
+MAX_BULK_CCS = 500
+
+
+class StreamClient:
+    """One connected /api/stream dashboard.
+
+    Holds at most one pending frame: deltas pushed while the client is
+    still writing the previous one are merged into it, so a slow client
+    gets fewer, larger frames instead of a growing backlog.
+    """
+
+    def __init__(self):
+        self.pending = {}
+        self.ready = asyncio.Event()
+        self.closed = False
+
+    def push(self, deltas):
+        for guild_id, count in deltas.items():
+            self.pending[guild_id] = self.pending.get(guild_id, 0) + count
+        self.ready.set()
+
+    def take(self):
+        deltas, self.pending = self.pending, {}
+        self.ready.clear()
+        return deltas
+
+    def close(self):
+        """Wake the handler so it ends the stream."""
+        self.closed = True
+        self.ready.set()
 
 class WebUI(commands.Cog):
     def __init__(self, bot: Red):
@@ -25,17 +78,34 @@ class WebUI(commands.Cog):
             "client_secret": None,
             "redirect_uri": "http://localhost:8080/oauth/callback",
             "port": 5050,
+            "snapshot_interval": SNAPSHOT_INTERVAL,
         }
         self.config.register_global(**default_global)
         self._authed_users = set()
         self._message_counts = {}
+        # Pre-serialized JSON bodies for polled endpoints: name -> (body, etag)
+        self._snapshots = {}
+        self._snapshot_now = asyncio.Event()
+        # Guilds sorted by (casefolded name, id) for paging and prefix search
+        self._guild_index = []
+        # Custom commands per guild as last read from / written to the
+        # CustomCommands config, with the serialized list response. Edits go
+        # through the per-guild lock so they can't interleave.
+        self._cc_cache = {}  # guild_id -> {name: command}
+        self._cc_bodies = {}  # guild_id -> (body, etag)
+        self._cc_locks = defaultdict(asyncio.Lock)
+        # Static files, loaded and compressed once when the server starts
+        self._assets = None
+        # Message counts since the last stream frame, and who to send it to
+        self._stream_deltas = {}
+        self._stream_clients = set()
+        self._closing = False
         bot.loop.create_task(self.start_server())
+        self._snapshot_task = bot.loop.create_task(self.snapshot_loop())
+        self._stream_task = bot.loop.create_task(self.stream_loop())
    
     async def handle_index_page(self, request):
-        html_path = Path(__file__).parent / "static" / "index.html"
-        if html_path.exists():
-            return web.FileResponse(html_path)
-        return web.Response(text="index.html not found", status=404)
+        return self._asset_response(request, "index.html", "index.html not found")
 
     async def start_server(self):
         await self.bot.wait_until_ready()
@@ -48,8 +118,10 @@ class WebUI(commands.Cog):
         app.router.add_get("/api/guild/{guild_id}", self.handle_guild_details)
         app.router.add_get("/api/guild/{guild_id}/ccs", self.handle_list_ccs)
         app.router.add_post("/api/guild/{guild_id}/ccs", self.handle_edit_cc)
+        app.router.add_post("/api/guild/{guild_id}/ccs/bulk", self.handle_bulk_cc)
         app.router.add_delete("/api/guild/{guild_id}/ccs/{cmd_name}", self.handle_delete_cc)
         app.router.add_get("/api/stats", self.handle_stats)
+        app.router.add_get("/api/stream", self.handle_stream)
 
         app.router.add_get("/admin", self.handle_admin_page)
         app.router.add_get("/oauth/login", self.handle_oauth_login)
@@ -58,7 +130,9 @@ class WebUI(commands.Cog):
 
         static_path = Path(__file__).parent / "static"
         if static_path.exists():
-            app.router.add_static("/", static_path, show_index=True)
+            loop = asyncio.get_running_loop()
+            self._assets = await loop.run_in_executor(None, AssetStore, static_path)
+            app.router.add_get("/{path:.+}", self.handle_asset)
 
         self._runner = web.AppRunner(app)
         await self._runner.setup()
@@ -70,16 +144,119 @@ class WebUI(commands.Cog):
             log.exception("Failed to start WebUI server")
 
     async def cog_unload(self):
+        self._snapshot_task.cancel()
+        self._stream_task.cancel()
+        # Open streams never finish on their own; end them first or
+        # runner.cleanup() waits out its shutdown timeout.
+        self._closing = True
+        for client in self._stream_clients:
+            client.close()
         if self._site:
             await self._site.stop()
         if self._runner:
             await self._runner.cleanup()
 
+    def refresh_snapshots(self):
+        """Recompute the dashboard aggregates and re-serialize them."""
+        guilds = self.bot.guilds
+        self._set_snapshot("stats", {
+            "total_guilds": len(guilds),
+            "total_users": sum(g.member_count for g in guilds),
+            "cogs_loaded": list(self.bot.cogs.keys())
+        })
+        self._guild_index = sorted(self._index_key(g) for g in guilds)
+
+    @staticmethod
+    def _index_key(guild):
+        return (guild.name.casefold(), guild.id)
+
+    def _set_snapshot(self, name, data):
+        self._snapshots[name] = self._serialize(data)
+
+    @staticmethod
+    def _serialize(data):
+        body = json.dumps(data).encode()
+        etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+        return body, etag
+
+    async def snapshot_loop(self):
+        await self.bot.wait_until_ready()
+        while True:
+            self._snapshot_now.clear()
+            try:
+                self.refresh_snapshots()
+            except Exception:
+                log.exception("Failed to refresh WebUI snapshots")
+            interval = await self.config.snapshot_interval()
+            try:
+                await asyncio.wait_for(self._snapshot_now.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def snapshot_response(self, request, name):
+        """Serve a snapshot, or 304 if the client's If-None-Match still matches."""
+        if name not in self._snapshots:
+            self.refresh_snapshots()
+        return self._conditional_response(request, *self._snapshots[name])
+
+    @staticmethod
+    def _conditional_response(request, body, etag, compress=False):
+        # Revalidate every time; unchanged responses cost one header compare.
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        gzipped = False
+        if compress:
+            # Each encoding is a different representation, so it gets its own ETag.
+            headers["Vary"] = "Accept-Encoding"
+            gzipped = len(body) >= MIN_COMPRESS_SIZE and accepts(
+                request.headers.get("Accept-Encoding", ""), "gzip"
+            )
+            if gzipped:
+                etag = headers["ETag"] = f'{etag[:-1]}-gzip"'
+        if etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=304, headers=headers)
+        if gzipped:
+            body = gzip.compress(body, mtime=0)
+            headers["Content-Encoding"] = "gzip"
+        return web.Response(body=body, content_type="application/json", headers=headers)
+
+    def _index_remove(self, key):
+        i = bisect.bisect_left(self._guild_index, key)
+        if i < len(self._guild_index) and self._guild_index[i] == key:
+            del self._guild_index[i]
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        bisect.insort(self._guild_index, self._index_key(guild))
+        self._snapshot_now.set()
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self._index_remove(self._index_key(guild))
+        self._snapshot_now.set()
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before, after):
+        if before.name != after.name:
+            self._index_remove(self._index_key(before))
+            bisect.insort(self._guild_index, self._index_key(after))
+
     @commands.Cog.listener()
     async def on_message(self, message):
         if message.guild and not message.author.bot:
             gid = message.guild.id
             self._message_counts[gid] = self._message_counts.get(gid, 0) + 1
+            if self._stream_clients:
+                self._stream_deltas[gid] = self._stream_deltas.get(gid, 0) + 1
+
+    async def stream_loop(self):
+        """Hand each stream client the deltas gathered over the last interval."""
+        while True:
+            await asyncio.sleep(STREAM_INTERVAL)
+            if not self._stream_deltas:
+                continue
+            deltas, self._stream_deltas = self._stream_deltas, {}
+            for client in self._stream_clients:
+                client.push(deltas)
 
     async def handle_ping(self, request):
         return web.json_response({"status": "ok", "message": "pong"})
@@ -88,24 +265,72 @@ class WebUI(commands.Cog):
         user_id = int(request.match_info["user_id"])
         user = self.bot.get_user(user_id)
         if user:
+            # Every page shows the user in its header; let browsers reuse it.
             return web.json_response({
                 "id": user.id,
                 "name": str(user),
                 "avatar": str(user.avatar_url) if hasattr(user, "avatar_url") else None,
-            })
+            }, headers={"Cache-Control": "private, max-age=300"})
         return web.json_response({"error": "User not found"}, status=404)
 
     async def handle_get_guilds(self, request):
         user_id = int(request.headers.get("X-User-ID", 0))
         if user_id not in self._authed_users:
             return web.json_response({"error": "Unauthorized"}, status=403)
-        return web.json_response({
-            "guilds": [ {
-                "id": str(g.id),
-                "name": g.name,
-                "member_count": g.member_count
-            } for g in self.bot.guilds ]
+
+        try:
+            limit = min(int(request.query.get("limit", GUILDS_PAGE_SIZE)), GUILDS_MAX_PAGE_SIZE)
+            after = self._decode_cursor(request.query["cursor"]) if "cursor" in request.query else None
+        except ValueError:
+            return web.json_response({"error": "Invalid limit or cursor"}, status=400)
+        fields = request.query.get("fields", ",".join(GUILD_FIELDS)).split(",")
+        if limit < 1 or not set(fields) <= set(GUILD_FIELDS):
+            return web.json_response(
+                {"error": f"limit must be positive and fields one of {', '.join(GUILD_FIELDS)}"},
+                status=400,
+            )
+
+        if not self._snapshots:
+            self.refresh_snapshots()
+        index = self._guild_index
+        prefix = request.query.get("q", "").casefold()
+        lo = bisect.bisect_left(index, (prefix,))
+        hi = bisect.bisect_left(index, (prefix + "\U0010ffff",)) if prefix else len(index)
+        start = max(lo, bisect.bisect_right(index, after)) if after else lo
+        page = index[start:min(start + limit, hi)]
+
+        guilds = []
+        for _, guild_id in page:
+            guild = self.bot.get_guild(guild_id)
+            if guild is not None:
+                guilds.append({field: self._guild_field(guild, field) for field in fields})
+        more = start + len(page) < hi
+        body, etag = self._serialize({
+            "guilds": guilds,
+            "total": hi - lo,
+            "next_cursor": self._encode_cursor(page[-1]) if more else None,
         })
+        return self._conditional_response(request, body, etag, compress=True)
+
+    def _guild_field(self, guild, field):
+        if field == "id":
+            return str(guild.id)
+        if field == "message_count":
+            return self._message_counts.get(guild.id, 0)
+        return getattr(guild, field)
+
+    @staticmethod
+    def _encode_cursor(key):
+        return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor):
+        """The index key a page ends at; ValueError if it isn't one of ours."""
+        try:
+            name, guild_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return (str(name), int(guild_id))
+        except (TypeError, ValueError):
+            raise ValueError(f"bad cursor: {cursor!r}") from None
 
     async def handle_guild_details(self, request):
         user_id = int(request.headers.get("X-User-ID", 0))
@@ -128,12 +353,82 @@ class WebUI(commands.Cog):
         user_id = int(request.headers.get("X-User-ID", 0))
         if user_id not in self._authed_users:
             return web.json_response({"error": "Unauthorized"}, status=403)
+        return self.snapshot_response(request, "stats")
 
-        return web.json_response({
-            "total_guilds": len(self.bot.guilds),
-            "total_users": sum(g.member_count for g in self.bot.guilds),
-            "cogs_loaded": list(self.bot.cogs.keys())
+    async def handle_stream(self, request):
+        """Server-Sent Events feed of per-guild message counts.
+
+        Opens with a "counts" event holding every guild's total, then sends
+        "delta" events with {"deltas": {...}, "totals": {...}} for the guilds
+        that saw messages. EventSource can't set headers, so the user ID may
+        also be passed as ?user_id=.
+        """
+        try:
+            user_id = int(request.headers.get("X-User-ID") or request.query.get("user_id", 0))
+        except ValueError:
+            user_id = None
+        if user_id not in self._authed_users:
+            return web.json_response({"error": "Unauthorized"}, status=403)
+        if self._closing or len(self._stream_clients) >= MAX_STREAM_CLIENTS:
+            return web.json_response({"error": "Too many open streams"}, status=503)
+
+        resp = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
         })
+        await resp.prepare(request)
+        client = StreamClient()
+        self._stream_clients.add(client)
+        try:
+            totals = {str(gid): count for gid, count in self._message_counts.items()}
+            await resp.write(self._sse("counts", totals))
+            while True:
+                try:
+                    await asyncio.wait_for(client.ready.wait(), STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    frame = b": keepalive\n\n"
+                else:
+                    if client.closed:
+                        break
+                    deltas = client.take()
+                    frame = self._sse("delta", {
+                        "deltas": {str(gid): count for gid, count in deltas.items()},
+                        "totals": {str(gid): self._message_counts.get(gid, 0) for gid in deltas},
+                    })
+                await asyncio.wait_for(resp.write(frame), STREAM_WRITE_TIMEOUT)
+        except (ConnectionResetError, asyncio.TimeoutError):
+            pass
+        finally:
+            self._stream_clients.discard(client)
+        return resp
+
+    @staticmethod
+    def _sse(event, data):
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+    def _cc_config(self, guild_id):
+        """The CustomCommands config group for a guild, or None if the cog isn't loaded."""
+        cog: CustomCommands = self.bot.get_cog("CustomCommands")
+        if not cog:
+            return None
+        return cog.config.guild_from_id(guild_id).commands
+
+    async def _get_ccs(self, guild_id, group):
+        """A guild's cached commands, read from config on first use. Hold its lock."""
+        if guild_id not in self._cc_cache:
+            self._cc_cache[guild_id] = await group()
+        return self._cc_cache[guild_id]
+
+    def _cc_changed(self, guild_id):
+        self._cc_bodies.pop(guild_id, None)
+
+    @commands.Cog.listener()
+    async def on_command_completion(self, ctx):
+        # Commands edited from Discord bypass the cache; reread on next use.
+        if ctx.guild and ctx.cog and ctx.cog.qualified_name == "CustomCommands":
+            self._cc_cache.pop(ctx.guild.id, None)
+            self._cc_changed(ctx.guild.id)
 
     async def handle_list_ccs(self, request):
         user_id = int(request.headers.get("X-User-ID", 0))
@@ -141,12 +436,24 @@ class WebUI(commands.Cog):
             return web.json_response({"error": "Unauthorized"}, status=403)
 
         guild_id = int(request.match_info["guild_id"])
-        cog: CustomCommands = self.bot.get_cog("CustomCommands")
-        if not cog:
+        group = self._cc_config(guild_id)
+        if group is None:
             return web.json_response({"error": "CustomCommands cog not loaded"}, status=500)
 
-        commands = await cog.config.guild_from_id(guild_id).commands()
-        return web.json_response({k.lower(): v for k, v in commands.items()})
+        if guild_id not in self._cc_bodies:
+            async with self._cc_locks[guild_id]:
+                ccs = await self._get_ccs(guild_id, group)
+                self._cc_bodies[guild_id] = self._serialize({k.lower(): v for k, v in ccs.items()})
+        return self._conditional_response(request, *self._cc_bodies[guild_id])
+
+    async def _set_cc(self, group, ccs, name, response):
+        # Only the response changes on an existing command, keeping its metadata
+        if name in ccs:
+            await group.set_raw(name, "response", value=response)
+            ccs[name]["response"] = response
+        else:
+            await group.set_raw(name, value={"response": response})
+            ccs[name] = {"response": response}
 
     async def handle_edit_cc(self, request):
         user_id = int(request.headers.get("X-User-ID", 0))
@@ -161,12 +468,67 @@ class WebUI(commands.Cog):
         if not name or not response:
             return web.json_response({"error": "Missing fields"}, status=400)
 
-        cog: CustomCommands = self.bot.get_cog("CustomCommands")
-        cmds = await cog.config.guild_from_id(guild_id).commands()
-        cmds[name] = {"response": response}
-        await cog.config.guild_from_id(guild_id).commands.set(cmds)
+        group = self._cc_config(guild_id)
+        if group is None:
+            return web.json_response({"error": "CustomCommands cog not loaded"}, status=500)
+        async with self._cc_locks[guild_id]:
+            ccs = await self._get_ccs(guild_id, group)
+            await self._set_cc(group, ccs, name, response)
+            self._cc_changed(guild_id)
         return web.json_response({"status": "success", "updated": name})
 
+    async def handle_bulk_cc(self, request):
+        """Create, edit and delete many commands at once.
+
+        Body: {"set": [{"name": ..., "response": ...}, ...], "delete": [name, ...]}.
+        Everything is validated first, then the whole batch is written at once.
+        """
+        user_id = int(request.headers.get("X-User-ID", 0))
+        if user_id not in self._authed_users:
+            return web.json_response({"error": "Unauthorized"}, status=403)
+
+        guild_id = int(request.match_info["guild_id"])
+        data = await request.json()
+        try:
+            items = [
+                (item["name"].strip().lower(), item["response"].strip())
+                for item in data.get("set", [])
+            ]
+            deletes = {name.strip().lower() for name in data.get("delete", [])}
+        except (TypeError, KeyError, AttributeError):
+            return web.json_response({"error": "Malformed request"}, status=400)
+        updates = dict(items)
+        if len(updates) < len(items):
+            return web.json_response({"error": "Commands set more than once"}, status=400)
+        if not all(updates) or not all(updates.values()) or not all(deletes):
+            return web.json_response({"error": "Missing fields"}, status=400)
+        if updates.keys() & deletes:
+            return web.json_response({"error": "Commands both set and deleted"}, status=400)
+        if len(updates) + len(deletes) > MAX_BULK_CCS:
+            return web.json_response({"error": f"At most {MAX_BULK_CCS} commands per request"}, status=400)
+
+        group = self._cc_config(guild_id)
+        if group is None:
+            return web.json_response({"error": "CustomCommands cog not loaded"}, status=500)
+        async with self._cc_locks[guild_id]:
+            # Build the new command set aside and write it in one go, so a
+            # failed write leaves both config and the cache as they were.
+            ccs = dict(await self._get_ccs(guild_id, group))
+            for name, response in updates.items():
+                ccs[name] = {**ccs[name], "response": response} if name in ccs else {"response": response}
+            deleted = [name for name in deletes if name in ccs]
+            for name in deleted:
+                del ccs[name]
+            await group.set(ccs)
+            self._cc_cache[guild_id] = ccs
+            self._cc_changed(guild_id)
+        return web.json_response({
+            "status": "success",
+            "updated": sorted(updates),
+            "deleted": sorted(deleted),
+            "not_found": sorted(deletes - set(deleted)),
+        })
+
     async def handle_delete_cc(self, request):
         user_id = int(request.headers.get("X-User-ID", 0))
         if user_id not in self._authed_users:
@@ -174,19 +536,36 @@ class WebUI(commands.Cog):
 
         guild_id = int(request.match_info["guild_id"])
         cmd_name = request.match_info["cmd_name"].lower()
-        cog: CustomCommands = self.bot.get_cog("CustomCommands")
-        cmds = await cog.config.guild_from_id(guild_id).commands()
-        if cmd_name in cmds:
-            del cmds[cmd_name]
-            await cog.config.guild_from_id(guild_id).commands.set(cmds)
-            return web.json_response({"status": "deleted", "command": cmd_name})
+        group = self._cc_config(guild_id)
+        if group is None:
+            return web.json_response({"error": "CustomCommands cog not loaded"}, status=500)
+        async with self._cc_locks[guild_id]:
+            ccs = await self._get_ccs(guild_id, group)
+            if cmd_name in ccs:
+                await group.clear_raw(cmd_name)
+                del ccs[cmd_name]
+                self._cc_changed(guild_id)
+                return web.json_response({"status": "deleted", "command": cmd_name})
         return web.json_response({"error": "Command not found"}, status=404)
 
     async def handle_admin_page(self, request):
-        html_path = Path(__file__).parent / "static" / "admin.html"
-        if html_path.exists():
-            return web.FileResponse(html_path)
-        return web.Response(text="Admin page not found", status=404)
+        return self._asset_response(request, "admin.html", "Admin page not found")
+
+    async def handle_asset(self, request):
+        return self._asset_response(request, request.match_info["path"], "Not found")
+
+    def _asset_response(self, request, path, missing):
+        asset, cache_control = self._assets.get(path) if self._assets else (None, None)
+        if asset is None:
+            return web.Response(text=missing, status=404)
+        encoding, body = asset.negotiate(request.headers.get("Accept-Encoding", ""))
+        etag = asset.etag if encoding == "identity" else f'{asset.etag[:-1]}-{encoding}"'
+        headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return web.Response(body=body, content_type=asset.content_type, headers=headers)
 
     async def handle_oauth_login(self, request):
         client_id = await self.config.client_id()
@@ -248,16 +627,24 @@ class WebUI(commands.Cog):
 
     @webuiconfig.command(name="set")
     async def webuiconfig_set(self, ctx, field: str, *, value: str):
-        valid_fields = ["client_id", "client_secret", "redirect_uri", "port"]
+        valid_fields = ["client_id", "client_secret", "redirect_uri", "port", "snapshot_interval"]
         if field not in valid_fields:
             await ctx.send(f"Invalid field. Choose from: {', '.join(valid_fields)}")
             return
-        if field == "port":
+        if field in ("port", "snapshot_interval"):
             try:
                 value = int(value)
             except ValueError:
-                await ctx.send("Port must be a number.")
+                await ctx.send(f"{field.replace('_', ' ').capitalize()} must be a number.")
+                return
+        if field == "snapshot_interval":
+            if value < 1:
+                await ctx.send("Snapshot interval must be at least 1 second.")
                 return
+            await self.config.snapshot_interval.set(value)
+            self._snapshot_now.set()
+            await ctx.send(f"Dashboard stats will be refreshed every {value}s.")
+            return
         await getattr(self.config, field).set(value)
         await ctx.send(f"Set `{field}` to `{value}`. Please restart the bot for changes to apply.")
 
@@ -267,6 +654,7 @@ class WebUI(commands.Cog):
         client_secret = await self.config.client_secret()
         redirect_uri = await self.config.redirect_uri()
         port = await self.config.port()
+        snapshot_interval = await self.config.snapshot_interval()
         masked = (
             client_secret[:4] + "..." + client_secret[-4:]
             if client_secret and len(client_secret) > 8 else "Not Set"
@@ -276,4 +664,5 @@ class WebUI(commands.Cog):
         embed.add_field(name="Client Secret", value=masked, inline=False)
         embed.add_field(name="Redirect URI", value=redirect_uri or "Not Set", inline=False)
         embed.add_field(name="Port", value=str(port), inline=False)
+        embed.add_field(name="Stats Refresh", value=f"Every {snapshot_interval}s", inline=False)
         await ctx.send(embed=embed)